@@ -1,12 +1,13 @@
 import os
 import sys
+from functools import cache
 from logging.config import fileConfig
 
 from sqlalchemy import engine_from_config, pool
+from sqlalchemy.engine import make_url
 
 import alembic
 from app.core.settings import get_settings  # Import settings if needed for DB URL
-from app.db.base_class import Base  # Import Base from your models
 
 # Adjust the path according to your actual project structure
 sys.path.insert(0, os.path.realpath(os.path.join(os.path.dirname(__file__), "..")))
@@ -20,18 +21,26 @@ config = alembic.context.config
 if config.config_file_name is not None:
     fileConfig(config.config_file_name)
 
-# add your model's MetaData object here
-# for 'autogenerate' support
-# from myapp import mymodel
-# target_metadata = mymodel.Base.metadata
-target_metadata = Base.metadata
-
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
 # ... etc.
 
 
+@cache
+def get_target_metadata():
+    """Return the model MetaData for 'autogenerate' support.
+
+    Model modules are imported here rather than at module level so that
+    alembic commands which never touch the metadata stay fast.
+    """
+    from app.db.base_model import BaseModel, import_models
+
+    import_models()
+    return BaseModel.metadata
+
+
+@cache
 def get_url():
     """Return the database URL from settings."""
     settings = get_settings()
@@ -53,7 +62,7 @@ def run_migrations_offline() -> None:
     url = get_url()
     alembic.context.configure(
         url=url,
-        target_metadata=target_metadata,
+        target_metadata=get_target_metadata(),
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -70,16 +79,25 @@ def run_migrations_online() -> None:
 
     """
     configuration = config.get_section(config.config_ini_section)
-    configuration["sqlalchemy.url"] = get_url()
+    url = get_url()
+    configuration["sqlalchemy.url"] = str(url)
+
+    # SQLite gains nothing from pooling; server databases reuse connections
+    # across migration steps
+    if make_url(str(url)).get_backend_name() == "sqlite":
+        pool_kwargs = {"poolclass": pool.NullPool}
+    else:
+        pool_kwargs = {"pool_pre_ping": True}
+
     connectable = engine_from_config(
         configuration,
         prefix="sqlalchemy.",
-        poolclass=pool.NullPool,
+        **pool_kwargs,
     )
 
     with connectable.connect() as connection:
         alembic.context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection, target_metadata=get_target_metadata()
         )
 
         with alembic.context.begin_transaction():
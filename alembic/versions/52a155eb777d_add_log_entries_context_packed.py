@@ -0,0 +1,53 @@
+"""add log_entries.context_packed
+
+Revision ID: 52a155eb777d
+Revises:
+Create Date: 2026-10-15 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '52a155eb777d'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Nullable with no default, so this is a metadata-only change on PostgreSQL.
+    # Existing rows keep their JSON context; no backfill is needed.
+    op.add_column('log_entries', sa.Column('context_packed', sa.LargeBinary(), nullable=True))
+
+
+def downgrade() -> None:
+    # Fold packed context back into the JSON column before dropping it
+    # (needs msgpack installed when any rows were written packed)
+    from app.db.types import JSONType
+
+    log_entries = sa.table(
+        'log_entries',
+        sa.column('id', sa.Uuid()),
+        sa.column('context', JSONType),
+        sa.column('context_packed', sa.LargeBinary()),
+    )
+    bind = op.get_bind()
+    rows = bind.execute(
+        sa.select(log_entries.c.id, log_entries.c.context_packed).where(
+            log_entries.c.context_packed.is_not(None)
+        )
+    ).all()
+    if rows:
+        import msgpack
+
+        for row in rows:
+            bind.execute(
+                log_entries.update()
+                .where(log_entries.c.id == row.id)
+                .values(context=msgpack.unpackb(row.context_packed, raw=False))
+            )
+    op.drop_column('log_entries', 'context_packed')
@@ -5,7 +5,7 @@ Application settings module.
 from functools import lru_cache
 from typing import Optional, Union
 
-from pydantic import AnyUrl, PostgresDsn, RedisDsn, field_validator
+from pydantic import AnyUrl, Field, PostgresDsn, RedisDsn, ValidationInfo, field_validator
 from pydantic_settings import BaseSettings
 
 
@@ -26,7 +26,7 @@ class Settings(BaseSettings):
 
     # Environment
     ENV: str = "development"
-    DEBUG: bool = ENV == "development"
+    DEBUG: bool = Field(default=None, validate_default=True)
 
     # Server Settings
     HOST: str = "0.0.0.0"
@@ -36,6 +36,9 @@ class Settings(BaseSettings):
     # Database
     DATABASE_URL: Optional[Union[PostgresDsn, SQLiteURL]] = None
     TEST_DATABASE_URL: str = "sqlite:///:memory:"
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_RECYCLE: int = 1800  # Seconds before a pooled connection is replaced
 
     # Redis
     REDIS_URL: Optional[RedisDsn] = None
@@ -45,6 +48,15 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
 
+    @field_validator("DEBUG", mode="before")
+    def default_debug_from_env(cls, v: Optional[bool], info: ValidationInfo) -> bool:
+        """
+        Enable debug mode in development unless DEBUG is set explicitly.
+        """
+        if v is None:
+            return info.data.get("ENV") == "development"
+        return v
+
     # CORS
     BACKEND_CORS_ORIGINS: list[str] = []
 
@@ -53,15 +65,26 @@ class Settings(BaseSettings):
         """
         Parse CORS origins from string or list.
         """
-        if isinstance(v, str) and not v.startswith("["):
-            return [i.strip() for i in v.split(",")]
-        elif isinstance(v, (list, str)):
+        if isinstance(v, list):
             return v
-        raise ValueError(v)
+        if isinstance(v, str):
+            if not v:
+                return []
+            if v.startswith("["):
+                return v
+            return [i for i in map(str.strip, v.split(",")) if i]
+        raise ValueError(f"Invalid BACKEND_CORS_ORIGINS value: {v!r}")
 
 
     # Logging
     LOG_LEVEL: str = "INFO"
+    # Store new log context as MessagePack in log_entries.context_packed
+    # instead of JSON(B) in log_entries.context. Cheaper writes and smaller
+    # rows, but packed context can't be indexed or filtered in SQL. Requires
+    # the optional msgpack package, and the context_packed column added by
+    # the alembic migration "add log_entries.context_packed". Existing rows
+    # keep their JSON context and stay readable either way.
+    LOG_CONTEXT_MSGPACK: bool = False
 
     class Config:
         env_file = ".env"
@@ -1,5 +1,5 @@
+import importlib
 from datetime import datetime
-from typing import Annotated
 
 from sqlalchemy import DateTime, func
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
@@ -25,3 +25,22 @@ class BaseModel(DeclarativeBase):
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
     )
+
+
+# Modules that define tables on BaseModel.metadata
+MODEL_MODULES = (
+    "app.modules.audit.models",
+    "app.modules.config.models",
+    "app.modules.feature_flags.models",
+    "app.modules.logging.models",
+    "app.modules.notifications.models",
+    "app.modules.webhooks.models",
+)
+
+
+def import_models() -> None:
+    """
+    Import all model modules so their tables are registered on BaseModel.metadata.
+    """
+    for module_name in MODEL_MODULES:
+        importlib.import_module(module_name)
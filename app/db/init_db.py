@@ -1,37 +1,69 @@
 import logging
+from typing import Sequence
 
-from sqlalchemy.orm import Session
+from sqlalchemy import insert, select
+from sqlalchemy.engine import Connection
 
 from app.core.settings import get_settings
-from app.db.session import Base, SessionLocal, engine
-from app.modules.audit.models import AuditLog  # noqa: F401
-from app.modules.config.models import ConfigScope  # noqa: F401
-from app.modules.feature_flags.models import FeatureFlag  # noqa: F401
-from app.modules.logging.models import LogEntry  # noqa: F401
-from app.modules.notifications.models import Notification  # noqa: F401
+from app.db.base_model import import_models
+from app.db.session import Base, engine
 
 settings = get_settings()
 logger = logging.getLogger(__name__)
 
+_DEFAULT_SCOPES: tuple[str, ...] = ("system", "auth", "logging", "notifications")
+
+_DEFAULT_SCOPE_ROWS: tuple[dict, ...] = tuple(
+    {
+        "name": scope_name,
+        "description": f"Default {scope_name} configuration scope",
+    }
+    for scope_name in _DEFAULT_SCOPES
+)
+
+_DEFAULT_FLAGS: tuple[dict, ...] = (
+    {
+        "key": "enable_webhooks",
+        "name": "Enable Webhooks",
+        "description": "Enable webhook dispatching functionality",
+        "enabled": True,
+    },
+    {
+        "key": "enable_notifications",
+        "name": "Enable Notifications",
+        "description": "Enable notification triggering functionality",
+        "enabled": True,
+    },
+    {
+        "key": "enable_audit_logging",
+        "name": "Enable Audit Logging",
+        "description": "Enable audit logging for sensitive actions",
+        "enabled": True,
+    },
+)
+
 
 def init_db() -> None:
     """
-    Initialize the database by creating all tables.
+    Initialize the database by creating all tables and seeding default data.
+
+    Table creation and seeding run inside a single transaction.
     """
     try:
-        # Create tables
-        Base.metadata.create_all(bind=engine)
+        # Register all tables on the metadata before creating them
+        import_models()
+
+        with engine.begin() as conn:
+            # Create tables
+            Base.metadata.create_all(bind=conn)
+
+            # Initialize default data if needed
+            init_default_data(conn)
+
         logger.info(
             "Database tables created successfully. "
             f"Database URL: {settings.SQLALCHEMY_DATABASE_URI.replace('postgresql://', '').split('@')[1]}"
         )
-
-        # Initialize default data if needed
-        db = SessionLocal()
-        try:
-            init_default_data(db)
-        finally:
-            db.close()
     except Exception as e:
         logger.error(
             f"Error initializing database: {e}. "
@@ -40,49 +72,47 @@ def init_db() -> None:
         raise
 
 
-def init_default_data(db: Session) -> None:
+def _seed_rows(conn: Connection, table, key: str, rows: Sequence[dict]) -> None:
+    """
+    Insert `rows` into `table` in one executemany, skipping rows whose `key` already exists.
+    """
+    dialect = conn.dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+        stmt = pg_insert(table).on_conflict_do_nothing(index_elements=[key])
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+        stmt = sqlite_insert(table).on_conflict_do_nothing(index_elements=[key])
+    elif dialect in ("mysql", "mariadb"):
+        stmt = insert(table).prefix_with("IGNORE")
+    else:
+        # No portable ON CONFLICT clause: filter out existing keys with a single IN query
+        column = table.c[key]
+        existing = set(
+            conn.execute(select(column).where(column.in_([row[key] for row in rows]))).scalars()
+        )
+        rows = [row for row in rows if row[key] not in existing]
+        stmt = insert(table)
+
+    if rows:
+        conn.execute(stmt, list(rows))
+
+
+def init_default_data(conn: Connection) -> None:
     """
     Initialize default data in the database.
+
+    Existing rows are left untouched; uniqueness is enforced by the database.
     """
+    from app.modules.config.models import ConfigScope
+    from app.modules.feature_flags.models import FeatureFlag
+
     # Create default config scopes if they don't exist
-    default_scopes = ["system", "auth", "logging", "notifications"]
-    for scope_name in default_scopes:
-        scope = db.query(ConfigScope).filter(ConfigScope.name == scope_name).first()
-        if not scope:
-            scope = ConfigScope(
-                name=scope_name,
-                description=f"Default {scope_name} configuration scope",
-            )
-            db.add(scope)
+    _seed_rows(conn, ConfigScope.__table__, "name", _DEFAULT_SCOPE_ROWS)
 
     # Create default feature flags if they don't exist
-    default_flags = [
-        {
-            "key": "enable_webhooks",
-            "name": "Enable Webhooks",
-            "description": "Enable webhook dispatching functionality",
-            "enabled": True,
-        },
-        {
-            "key": "enable_notifications",
-            "name": "Enable Notifications",
-            "description": "Enable notification triggering functionality",
-            "enabled": True,
-        },
-        {
-            "key": "enable_audit_logging",
-            "name": "Enable Audit Logging",
-            "description": "Enable audit logging for sensitive actions",
-            "enabled": True,
-        },
-    ]
-
-    for flag_data in default_flags:
-        flag = db.query(FeatureFlag).filter(FeatureFlag.key == flag_data["key"]).first()
-        if not flag:
-            flag = FeatureFlag(**flag_data)
-            db.add(flag)
-
-    # Commit all changes
-    db.commit()
+    _seed_rows(conn, FeatureFlag.__table__, "key", _DEFAULT_FLAGS)
+
     logger.info("Default data initialized successfully")
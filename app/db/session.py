@@ -3,35 +3,102 @@ Database session module.
 """
 
 import os
-import json
-from sqlalchemy import create_engine
+from contextlib import contextmanager
+
+import orjson
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 
 from app.core.settings import get_settings
 from app.db.base_model import BaseModel as Base
 
 settings = get_settings()
 
+
+def _json_serializer(obj) -> str:
+    """
+    Serialize JSON column values with orjson.
+    """
+    return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
 # Create SQLAlchemy engine
 # Use test database URL if TESTING environment variable is set
 database_url = settings.TEST_DATABASE_URL if os.getenv("TESTING") else settings.DATABASE_URL
+
+url = make_url(str(database_url))
+is_sqlite = url.get_backend_name() == "sqlite"
+is_sqlite_memory = is_sqlite and url.database in (None, "", ":memory:")
+
+engine_kwargs = {}
+if is_sqlite:
+    # Allow the connection to be used from FastAPI's threadpool; an in-memory
+    # database only exists on a single connection, so share it via StaticPool
+    engine_kwargs["connect_args"] = {"check_same_thread": False}
+    if is_sqlite_memory:
+        engine_kwargs["poolclass"] = StaticPool
+else:
+    # Keep a sized, health-checked connection pool for server databases
+    engine_kwargs.update(
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_pre_ping=True,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+    )
+    if url.get_driver_name() == "psycopg":
+        # Use server-side prepared statements from the first execution
+        engine_kwargs["connect_args"] = {"prepare_threshold": 0}
+
 engine = create_engine(
-    str(database_url),
-    json_serializer=lambda obj: json.dumps(obj, ensure_ascii=False),
-    json_deserializer=lambda obj: json.loads(obj),
+    url,
+    json_serializer=_json_serializer,
+    json_deserializer=orjson.loads,
+    **engine_kwargs,
 )
 
+if is_sqlite and not is_sqlite_memory:
+
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragma(dbapi_connection, connection_record):
+        """
+        Enable write-ahead logging for file-backed SQLite databases.
+        """
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.close()
+
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
-# Dependency to get DB session
-def get_db():
+@contextmanager
+def db_session():
     """
-    Get a database session.
+    Provide a database session that is closed on exit.
+
+    For use outside of FastAPI dependency injection (scripts, scheduled tasks).
     """
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+# Dependency to get DB session
+def get_db():
+    """
+    Get a database session.
+    """
+    with db_session() as db:
+        yield db
+
+
+def shutdown() -> None:
+    """
+    Release all pooled database connections.
+    """
+    engine.dispose()
@@ -0,0 +1,80 @@
+"""
+Column types shared across models.
+"""
+
+from enum import Enum as PyEnum
+from typing import Type
+
+from sqlalchemy import JSON, Enum, LargeBinary, String
+from sqlalchemy.dialects.postgresql import INET, JSONB
+from sqlalchemy.types import TypeDecorator
+
+# JSON column stored as binary JSONB on PostgreSQL and plain JSON elsewhere
+JSONType = JSON().with_variant(JSONB(), "postgresql")
+
+
+class IPAddressType(TypeDecorator):
+    """
+    IP address column stored as native INET on PostgreSQL and as text elsewhere.
+
+    Accepts strings or ``ipaddress`` objects, and always returns strings,
+    regardless of how the driver decodes INET.
+    """
+
+    impl = String(45)  # IPv6 can be up to 45 chars
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return str(value) if value is not None else None
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(INET())
+        return dialect.type_descriptor(self.impl)
+
+    def process_result_value(self, value, dialect):
+        return str(value) if value is not None else None
+
+
+class MsgPackType(TypeDecorator):
+    """
+    Column storing a JSON-compatible value as MessagePack bytes (BYTEA on PostgreSQL).
+
+    Smaller and cheaper to encode than JSON, but opaque to the database: the
+    value can't be indexed or filtered in SQL. Encoding requires the optional
+    ``msgpack`` package, which is imported on first non-NULL value.
+    """
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        import msgpack  # Optional dependency, only needed once values are stored
+
+        return msgpack.packb(value, use_bin_type=True)
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        import msgpack  # Optional dependency, only needed once values are stored
+
+        return msgpack.unpackb(value, raw=False)
+
+
+def enum_type(enum_cls: Type[PyEnum]) -> Enum:
+    """
+    Enum column type that stores the members' values rather than their names.
+
+    PostgreSQL gets a native ENUM type; other databases store a VARCHAR with
+    a CHECK constraint. Both enum members and their string values are
+    accepted on write, and members are returned on read.
+    """
+    return Enum(
+        enum_cls,
+        name=enum_cls.__name__.lower(),
+        values_callable=lambda members: [member.value for member in members],
+        validate_strings=True,
+        create_constraint=True,
+    )
@@ -9,6 +9,7 @@ from prometheus_fastapi_instrumentator import Instrumentator
 
 from app.core.settings import get_settings
 from app.db.init_db import init_db
+from app.db.session import shutdown as shutdown_db
 
 # Import routers for different modules
 from app.modules.audit.router import router as audit_router
@@ -84,6 +85,7 @@ async def lifespan(app: FastAPI):
     yield
     # Shutdown
     logger.info("Shutting down application...")
+    shutdown_db()
     logger.info("Platform Core service finished shutting down.")
 
 
@@ -1,12 +1,14 @@
+import uuid
 from datetime import datetime
 from typing import Any, Dict, Optional
 
-from pydantic import BaseModel, Field
-from sqlalchemy import JSON, String, Text
+from pydantic import BaseModel, ConfigDict, Field, IPvAnyAddress
+from sqlalchemy import Index, String, Uuid
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base_model import BaseModel as DBBaseModel
-from app.db.session import Base
+from app.db.types import IPAddressType, JSONType
+from app.utils.common import uuid7
 
 
 class AuditLog(DBBaseModel):
@@ -15,17 +17,25 @@ class AuditLog(DBBaseModel):
     """
     __tablename__ = "auditlog"
 
-    actor_id: Mapped[str] = mapped_column(String(255), index=True, nullable=False)
+    id: Mapped[uuid.UUID] = mapped_column(Uuid, primary_key=True, default=uuid7)  # Time-ordered UUIDv7
+    actor_id: Mapped[str] = mapped_column(String(255), nullable=False)
     event_type: Mapped[str] = mapped_column(String(100), index=True, nullable=False)
-    resource_type: Mapped[str] = mapped_column(String(100), index=True, nullable=False)
-    resource_id: Mapped[str] = mapped_column(String(255), index=True, nullable=False)
+    resource_type: Mapped[str] = mapped_column(String(100), nullable=False)
+    resource_id: Mapped[str] = mapped_column(String(255), nullable=False)
     action: Mapped[str] = mapped_column(String(50), index=True, nullable=False)
-    old_value: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
-    new_value: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    diff: Mapped[Optional[Dict[str, Any]]] = mapped_column(
+        JSONType, nullable=True
+    )  # Changed fields only, as {field: {"old": ..., "new": ...}}
     event_metadata: Mapped[Optional[Dict[str, Any]]] = mapped_column(
-        JSON, nullable=True
+        JSONType, nullable=True
     )  # Renamed from metadata to avoid SQLAlchemy conflict
-    ip_address: Mapped[Optional[str]] = mapped_column(String(45), nullable=True)  # IPv6 can be up to 45 chars
+    ip_address: Mapped[Optional[str]] = mapped_column(IPAddressType, nullable=True)
+
+    # Create indexes for common query patterns
+    __table_args__ = (
+        Index("ix_auditlog_actor_id_created_at", "actor_id", "created_at"),
+        Index("ix_auditlog_resource_type_resource_id", "resource_type", "resource_id"),
+    )
 
 
 # Pydantic models for API
@@ -47,10 +57,14 @@ class AuditLogCreate(BaseModel):
     )
     resource_id: str
     action: str
-    old_value: Optional[str] = None
-    new_value: Optional[str] = None
+    old_value: Optional[Any] = Field(
+        None, description="Previous value (scalar or object); stored as a diff"
+    )
+    new_value: Optional[Any] = Field(
+        None, description="New value (scalar or object); stored as a diff"
+    )
     event_metadata: Optional[Dict[str, Any]] = None  # Renamed from metadata
-    ip_address: Optional[str] = None
+    ip_address: Optional[IPvAnyAddress] = None
 
 
 class AuditLogResponse(BaseModel):
@@ -58,17 +72,15 @@ class AuditLogResponse(BaseModel):
     Schema for audit log response.
     """
 
-    id: int
+    model_config = ConfigDict(from_attributes=True)
+
+    id: uuid.UUID
     actor_id: str
     event_type: str
     resource_type: str
     resource_id: str
     action: str
-    old_value: Optional[str] = None
-    new_value: Optional[str] = None
+    diff: Optional[Dict[str, Any]] = None
     event_metadata: Optional[Dict[str, Any]] = None  # Renamed from metadata
     ip_address: Optional[str] = None
     created_at: datetime
-
-    class Config:
-        orm_mode = True
@@ -1,3 +1,4 @@
+import uuid
 from datetime import datetime
 from typing import List, Optional
 
@@ -50,7 +51,7 @@ async def list_audit_logs(
 
 
 @router.get("/{audit_log_id}", response_model=AuditLogResponse)
-async def get_audit_log(audit_log_id: int, db: Session = Depends(get_db)):
+async def get_audit_log(audit_log_id: uuid.UUID, db: Session = Depends(get_db)):
     """
     Get an audit log by ID.
     """
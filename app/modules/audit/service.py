@@ -1,3 +1,4 @@
+import uuid
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
@@ -16,15 +17,19 @@ class AuditService:
         """
         Create a new audit log entry.
         """
+        # JSON columns can't store datetime/Decimal/UUID values as-is, so
+        # normalise them the way the API would serialize them
+        values = audit_log.model_dump(
+            mode="json", include={"old_value", "new_value", "event_metadata"}
+        )
         db_audit_log = AuditLog(
             actor_id=audit_log.actor_id,
             event_type=audit_log.event_type,
             resource_type=audit_log.resource_type,
             resource_id=audit_log.resource_id,
             action=audit_log.action,
-            old_value=audit_log.old_value,
-            new_value=audit_log.new_value,
-            event_metadata=audit_log.event_metadata,
+            diff=AuditService._compute_diff(values["old_value"], values["new_value"]),
+            event_metadata=values["event_metadata"],
             ip_address=audit_log.ip_address,
         )
 
@@ -34,6 +39,28 @@ class AuditService:
 
         return db_audit_log
 
+    @staticmethod
+    def _compute_diff(old_value: Any, new_value: Any) -> Optional[Dict[str, Any]]:
+        """
+        Compute the changed fields between two values.
+
+        Objects are compared key by key and only differing keys are kept;
+        any other values are recorded under the "value" field.
+        """
+        if old_value is None and new_value is None:
+            return None
+
+        if isinstance(old_value, (dict, type(None))) and isinstance(new_value, (dict, type(None))):
+            old_value = old_value or {}
+            new_value = new_value or {}
+            return {
+                key: {"old": old_value.get(key), "new": new_value.get(key)}
+                for key in old_value.keys() | new_value.keys()
+                if old_value.get(key) != new_value.get(key)
+            }
+
+        return {"value": {"old": old_value, "new": new_value}}
+
     @staticmethod
     async def get_audit_logs(
         db: Session,
@@ -81,7 +108,7 @@ class AuditService:
         return query.offset(skip).limit(limit).all()
 
     @staticmethod
-    async def get_audit_log_by_id(db: Session, audit_log_id: int) -> Optional[AuditLog]:
+    async def get_audit_log_by_id(db: Session, audit_log_id: uuid.UUID) -> Optional[AuditLog]:
         """
         Get an audit log by ID.
         """
@@ -134,8 +161,8 @@ class AuditService:
             resource_type="feature_flag",
             resource_id=flag_key,
             action=action,
-            old_value=str(old_value) if old_value is not None else None,
-            new_value=str(new_value),
+            old_value=old_value,
+            new_value=new_value,
             event_metadata={"flag_key": flag_key},
             ip_address=ip_address,
         )
@@ -161,8 +188,8 @@ class AuditService:
             resource_type="webhook",
             resource_id=webhook_id,
             action=action,
-            old_value=str(old_value) if old_value else None,
-            new_value=str(new_value) if new_value else None,
+            old_value=old_value,
+            new_value=new_value,
             event_metadata={"webhook_id": webhook_id},
             ip_address=ip_address,
         )
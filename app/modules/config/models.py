@@ -1,8 +1,8 @@
 from datetime import datetime
 from typing import List, Optional
 
-from pydantic import BaseModel, Field
-from sqlalchemy import ForeignKey, Integer, JSON, String, Text, UniqueConstraint
+from pydantic import BaseModel, ConfigDict, Field
+from sqlalchemy import Boolean, ForeignKey, Integer, String, Text, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base_model import BaseModel as DBBaseModel
@@ -33,7 +33,7 @@ class ConfigItem(DBBaseModel):
     value: Mapped[str] = mapped_column(Text, nullable=False)
     description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     version: Mapped[int] = mapped_column(Integer, default=1, nullable=False)
-    is_secret: Mapped[bool] = mapped_column(Integer, default=0, nullable=False)
+    is_secret: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     scope_id: Mapped[int] = mapped_column(ForeignKey("configscope.id"), nullable=False)
     
     # Relationships
@@ -81,15 +81,15 @@ class ConfigScopeResponse(BaseModel):
     """
     Schema for config scope response.
     """
+
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     name: str
     description: Optional[str] = None
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        orm_mode = True
-
 
 class ConfigItemCreate(BaseModel):
     """
@@ -114,6 +114,9 @@ class ConfigItemResponse(BaseModel):
     """
     Schema for config item response.
     """
+
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     key: str
     value: str
@@ -124,19 +127,16 @@ class ConfigItemResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        orm_mode = True
-
 
 class ConfigHistoryResponse(BaseModel):
     """
     Schema for config history response.
     """
+
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     value: str
     version: int
     changed_by: Optional[str] = None
     created_at: datetime
-
-    class Config:
-        orm_mode = True
@@ -90,7 +90,7 @@ class ConfigService:
             key=item.key,
             value=item.value,
             description=item.description,
-            is_secret=1 if item.is_secret else 0,
+            is_secret=item.is_secret,
             scope_id=scope.id,
         )
 
@@ -209,7 +209,7 @@ class ConfigService:
             db_config.description = item_update.description
 
         if item_update.is_secret is not None:
-            db_config.is_secret = 1 if item_update.is_secret else 0
+            db_config.is_secret = item_update.is_secret
 
         db.commit()
         db.refresh(db_config)
@@ -1,12 +1,12 @@
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel, Field
-from sqlalchemy import JSON, Boolean, String, Text
+from pydantic import BaseModel, ConfigDict, Field
+from sqlalchemy import Boolean, String, Text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base_model import BaseModel as DBBaseModel
-from app.db.session import Base
+from app.db.types import JSONType
 
 
 class FeatureFlag(DBBaseModel):
@@ -19,7 +19,7 @@ class FeatureFlag(DBBaseModel):
     name: Mapped[str] = mapped_column(String(255), nullable=False)
     description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     enabled: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
-    rules: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSON, nullable=True)  # For user/group targeting
+    rules: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSONType, nullable=True)  # For user/group targeting
 
 
 # Pydantic models for API
@@ -55,6 +55,8 @@ class FeatureFlagResponse(BaseModel):
     Schema for feature flag response.
     """
 
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     key: str
     name: str
@@ -66,9 +68,6 @@ class FeatureFlagResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        orm_mode = True
-
 
 class FeatureFlagCheck(BaseModel):
     """
@@ -1,8 +1,11 @@
+import copy
 import logging
+import threading
 from datetime import timedelta
 from typing import Any, Dict, List, Optional
 
 import redis
+from cachetools import TTLCache
 from sqlalchemy.orm import Session
 
 from .models import FeatureFlag, FeatureFlagCreate, FeatureFlagUpdate
@@ -13,6 +16,17 @@ logger = logging.getLogger(__name__)
 FEATURE_FLAG_CACHE_PREFIX = "feature_flag:"
 # Cache TTL (e.g., 5 minutes)
 FEATURE_FLAG_CACHE_TTL = timedelta(minutes=5)
+# In-process cache in front of Redis. Invalidation only reaches the local
+# process, so other workers may serve a changed flag for up to this long.
+FEATURE_FLAG_LOCAL_CACHE_TTL = timedelta(seconds=30)
+FEATURE_FLAG_LOCAL_CACHE_SIZE = 256
+
+# TTLCache isn't thread-safe; every access goes through the lock
+_local_flag_cache: TTLCache = TTLCache(
+    maxsize=FEATURE_FLAG_LOCAL_CACHE_SIZE,
+    ttl=FEATURE_FLAG_LOCAL_CACHE_TTL.total_seconds(),
+)
+_local_flag_cache_lock = threading.Lock()
 
 
 class FeatureFlagsService:
@@ -33,7 +47,7 @@ class FeatureFlagsService:
         if existing:
             raise ValueError(f"Feature flag with key '{flag_in.key}' already exists.")
 
-        db_flag = FeatureFlag(**flag_in.dict())
+        db_flag = FeatureFlag(**flag_in.model_dump())
         db.add(db_flag)
         db.commit()
         db.refresh(db_flag)
@@ -67,7 +81,7 @@ class FeatureFlagsService:
         if not db_flag:
             return None
 
-        update_data = flag_update.dict(exclude_unset=True)
+        update_data = flag_update.model_dump(exclude_unset=True)
         for key, value in update_data.items():
             setattr(db_flag, key, value)
 
@@ -76,7 +90,7 @@ class FeatureFlagsService:
         logger.info(f"Feature flag updated: Key='{db_flag.key}', Changes={update_data}")
 
         # Invalidate cache if relevant fields changed
-        if "enabled" in update_data or "description" in update_data:
+        if update_data.keys() & {"enabled", "description", "rules"}:
             FeatureFlagsService.invalidate_flag_cache(redis_client, flag_key)
 
         return db_flag
@@ -105,35 +119,49 @@ class FeatureFlagsService:
         db: Session, redis_client: redis.Redis, flag_key: str, context: Dict[str, Any]
     ) -> bool:
         """Checks if a feature flag is enabled for the given context."""
-        # 1. Check Cache
-        cached_flag = FeatureFlagsService._get_flag_from_cache(redis_client, flag_key)
-        if cached_flag is not None:
-            logger.debug(f"Cache hit for feature flag '{flag_key}'")
-            # Evaluate rules based on cached data
-            return FeatureFlagsService._evaluate_rules(
-                globally_enabled=cached_flag["enabled"],
-                rules=cached_flag.get("rules"),
-                context=context,
-            )
+        flag_data = FeatureFlagsService.get_flag(db, redis_client, flag_key)
 
-        # 2. Cache miss - Fetch from DB
-        logger.debug(f"Cache miss for feature flag '{flag_key}'. Fetching from DB.")
-        db_flag = db.query(FeatureFlag).filter(FeatureFlag.key == flag_key).first()
-
-        if not db_flag:
+        if flag_data is None:
             # Flag doesn't exist
             logger.warning(f"Feature flag '{flag_key}' not found during evaluation.")
             raise ValueError(f"Feature flag '{flag_key}' not found.")
 
-        # 3. Evaluate Rules
-        is_enabled = FeatureFlagsService._evaluate_rules(
-            globally_enabled=db_flag.enabled, rules=db_flag.rules, context=context
+        return FeatureFlagsService._evaluate_rules(
+            globally_enabled=flag_data["enabled"],
+            rules=flag_data.get("rules"),
+            context=context,
         )
 
-        # 4. Update Cache
-        FeatureFlagsService._cache_flag(redis_client, db_flag)
-
-        return is_enabled
+    @staticmethod
+    def get_flag(
+        db: Session, redis_client: redis.Redis, flag_key: str
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Retrieves flag data for evaluation, consulting the caches before the DB.
+
+        Returns a copy, so callers can't mutate the cached entry.
+        """
+        # 1. Check in-process cache
+        with _local_flag_cache_lock:
+            flag_data = _local_flag_cache.get(flag_key)
+        if flag_data is not None:
+            return copy.deepcopy(flag_data)
+
+        # 2. Check Redis cache
+        flag_data = FeatureFlagsService._get_flag_from_cache(redis_client, flag_key)
+        if flag_data is not None:
+            logger.debug(f"Cache hit for feature flag '{flag_key}'")
+        else:
+            # 3. Cache miss - Fetch from DB and update Redis
+            logger.debug(f"Cache miss for feature flag '{flag_key}'. Fetching from DB.")
+            db_flag = FeatureFlagsService.get_feature_flag_by_key(db, flag_key)
+            if not db_flag:
+                return None
+            flag_data = FeatureFlagsService._cache_flag(redis_client, db_flag)
+
+        with _local_flag_cache_lock:
+            _local_flag_cache[flag_key] = copy.deepcopy(flag_data)
+        return flag_data
 
     @staticmethod
     def _evaluate_rules(
@@ -197,18 +225,18 @@ class FeatureFlagsService:
         return None
 
     @staticmethod
-    def _cache_flag(redis_client: redis.Redis, flag: FeatureFlag):
-        """Stores flag data in Redis cache."""
+    def _cache_flag(redis_client: redis.Redis, flag: FeatureFlag) -> Dict[str, Any]:
+        """Stores flag data in Redis cache and returns it."""
         cache_key = FeatureFlagsService._get_cache_key(flag.key)
+        flag_data = {
+            "key": flag.key,
+            "enabled": flag.enabled,
+            "rules": flag.rules,
+            "updated_at": flag.updated_at.isoformat() if flag.updated_at else None,
+        }
         try:
             import json
 
-            flag_data = {
-                "key": flag.key,
-                "enabled": flag.enabled,
-                "rules": flag.rules,
-                "updated_at": flag.updated_at.isoformat() if flag.updated_at else None,
-            }
             redis_client.set(
                 cache_key, json.dumps(flag_data), ex=FEATURE_FLAG_CACHE_TTL
             )
@@ -217,10 +245,18 @@ class FeatureFlagsService:
             logger.error(f"Redis error setting cache for '{flag.key}': {e}")
         except TypeError as e:
             logger.error(f"Serialization error caching flag '{flag.key}': {e}")
+        return flag_data
 
     @staticmethod
     def invalidate_flag_cache(redis_client: redis.Redis, flag_key: str):
-        """Removes a flag from the Redis cache."""
+        """
+        Removes a flag from the in-process and Redis caches.
+
+        Only this process's in-process cache is cleared; other workers keep
+        their entry until it expires (FEATURE_FLAG_LOCAL_CACHE_TTL).
+        """
+        with _local_flag_cache_lock:
+            _local_flag_cache.pop(flag_key, None)
         cache_key = FeatureFlagsService._get_cache_key(flag_key)
         try:
             redis_client.delete(cache_key)
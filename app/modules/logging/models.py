@@ -2,16 +2,24 @@
 Models for the logging module.
 """
 
+import uuid
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Sequence
 
-from pydantic import BaseModel, Field, ConfigDict
-from sqlalchemy import JSON, DateTime, Integer, String, Text, Index, Column
+from pydantic import BaseModel, Field, ConfigDict, IPvAnyAddress, model_validator
+from sqlalchemy import DateTime, String, Text, Index, Column, Uuid, desc, lambda_stmt, select, text, type_coerce
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.sql.lambdas import StatementLambdaElement
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.sql import func
 
+from app.core.settings import get_settings
 from app.db.base_model import BaseModel as DBBaseModel
+from app.db.types import IPAddressType, JSONType, MsgPackType
+from app.utils.common import uuid7
+
+settings = get_settings()
 
 
 class LogLevel(str, Enum):
@@ -25,6 +33,13 @@ class LogLevel(str, Enum):
     CRITICAL = "CRITICAL"
 
 
+def _not_postgresql(ddl, target, bind, dialect, **kw) -> bool:
+    """
+    DDL condition for indexes that PostgreSQL replaces with a specialised variant.
+    """
+    return dialect.name != "postgresql"
+
+
 class LogEntry(DBBaseModel):
     """
     Model for storing structured log entries in the database.
@@ -32,21 +47,52 @@ class LogEntry(DBBaseModel):
 
     __tablename__ = "log_entries"
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True, index=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), index=True)
-    level: Mapped[str] = mapped_column(String(10), index=True)  # INFO, WARNING, ERROR, DEBUG, etc.
-    source: Mapped[str] = mapped_column(String(100), index=True)  # Service or component name
+    id: Mapped[uuid.UUID] = mapped_column(Uuid, primary_key=True, default=uuid7)  # Time-ordered UUIDv7
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    level: Mapped[str] = mapped_column(String(10))  # INFO, WARNING, ERROR, DEBUG, etc.
+    source: Mapped[str] = mapped_column(String(100))  # Service or component name
     message: Mapped[str] = mapped_column(Text)
-    context: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSON, nullable=True)  # Additional context data
+    context: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSONType, nullable=True)  # Additional context data
+    context_packed: Mapped[Optional[Dict[str, Any]]] = mapped_column(
+        MsgPackType, nullable=True
+    )  # Context as MessagePack instead, when LOG_CONTEXT_MSGPACK is on
     trace_id: Mapped[Optional[str]] = mapped_column(String(100), nullable=True, index=True)  # For distributed tracing
     span_id: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)  # For distributed tracing
-    user_id: Mapped[Optional[str]] = mapped_column(String(100), nullable=True, index=True)  # User ID if applicable
-    ip_address: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)  # Client IP address if applicable
+    user_id: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)  # User ID if applicable
+    ip_address: Mapped[Optional[str]] = mapped_column(IPAddressType, nullable=True)  # Client IP address if applicable
 
     # Create indexes for common query patterns
     __table_args__ = (
-        Index('ix_log_entries_level_created_at', 'level', 'created_at'),
-        Index('ix_log_entries_source_created_at', 'source', 'created_at'),
+        # Equality columns first, then the sort column, so filtered pages
+        # are read newest-first straight from the index. Listings sort by
+        # the time-ordered id, which avoids ties between equal timestamps.
+        Index('ix_log_entries_level_id', 'level', desc('id')),
+        Index('ix_log_entries_source_id', 'source', desc('id')),
+        Index('ix_log_entries_source_level_id', 'source', 'level', desc('id')),
+        Index('ix_log_entries_user_id_id', 'user_id', desc('id')),
+        # Time-range filters and pruning: a compact BRIN index on PostgreSQL, where
+        # rows arrive in created_at order, and a regular B-tree elsewhere
+        Index(
+            'ix_log_entries_created_at_brin',
+            'created_at',
+            postgresql_using='brin',
+            postgresql_with={'pages_per_range': 32},
+        ).ddl_if(dialect='postgresql'),
+        Index('ix_log_entries_created_at', 'created_at').ddl_if(callable_=_not_postgresql),
+        # GIN index for JSONB containment (@>) filters on context, PostgreSQL only
+        Index(
+            'ix_log_entries_context_gin',
+            'context',
+            postgresql_using='gin',
+            postgresql_ops={'context': 'jsonb_path_ops'},
+        ).ddl_if(dialect='postgresql'),
+        # Partial index for error dashboards
+        Index(
+            'ix_log_entries_errors_created_at',
+            'created_at',
+            postgresql_where=text("level IN ('ERROR', 'CRITICAL')"),
+            sqlite_where=text("level IN ('ERROR', 'CRITICAL')"),
+        ),
     )
 
 
@@ -64,7 +110,7 @@ class LogEntryCreate(BaseModel):
     )
     span_id: Optional[str] = Field(None, description="Span ID for distributed tracing")
     user_id: Optional[str] = Field(None, description="User ID if applicable")
-    ip_address: Optional[str] = Field(
+    ip_address: Optional[IPvAnyAddress] = Field(
         None, description="Client IP address if applicable"
     )
 
@@ -76,7 +122,7 @@ class LogEntryResponse(BaseModel):
 
     model_config = ConfigDict(from_attributes=True)
 
-    id: int
+    id: uuid.UUID
     created_at: datetime
     level: LogLevel
     message: str
@@ -87,6 +133,17 @@ class LogEntryResponse(BaseModel):
     user_id: Optional[str] = None
     ip_address: Optional[str] = None
 
+    @model_validator(mode="before")
+    @classmethod
+    def unpack_context(cls, data: Any) -> Any:
+        """
+        Report MessagePack-stored context as ``context``.
+        """
+        packed = getattr(data, "context_packed", None)
+        if packed is None:
+            return data
+        return {**{name: getattr(data, name) for name in cls.model_fields}, "context": packed}
+
 
 class LogQueryParams(BaseModel):
     """
@@ -99,5 +156,86 @@ class LogQueryParams(BaseModel):
     end_time: Optional[datetime] = None
     trace_id: Optional[str] = None
     user_id: Optional[str] = None
+    context_contains: Optional[Dict[str, Any]] = Field(
+        None, description="Only entries whose context contains this object (PostgreSQL only)"
+    )
+    after_id: Optional[uuid.UUID] = Field(
+        None, description="Keyset cursor: only entries older than this ID"
+    )
     limit: int = 100
     offset: int = 0
+
+
+def build_log_query(
+    params: LogQueryParams, columns: Optional[Sequence[Any]] = None
+) -> StatementLambdaElement:
+    """
+    Build a cached SELECT for log entries matching the query parameters.
+
+    Each filter is added as its own lambda so SQLAlchemy caches the compiled
+    SQL per combination of filters in use; only the bound values change
+    between requests. Pass `columns` to select plain rows instead of
+    `LogEntry` objects.
+    """
+    if columns is None:
+        stmt = lambda_stmt(lambda: select(LogEntry))
+    else:
+        stmt = lambda_stmt(lambda: select(*columns))
+
+    level = params.level
+    source = params.source
+    start_time = params.start_time
+    end_time = params.end_time
+    trace_id = params.trace_id
+    user_id = params.user_id
+    context_contains = params.context_contains
+    after_id = params.after_id
+    offset = params.offset
+    limit = params.limit
+
+    if level:
+        stmt += lambda s: s.where(LogEntry.level == level)
+    if source:
+        stmt += lambda s: s.where(LogEntry.source == source)
+    if start_time:
+        stmt += lambda s: s.where(LogEntry.created_at >= start_time)
+    if end_time:
+        stmt += lambda s: s.where(LogEntry.created_at <= end_time)
+    if trace_id:
+        stmt += lambda s: s.where(LogEntry.trace_id == trace_id)
+    if user_id:
+        stmt += lambda s: s.where(LogEntry.user_id == user_id)
+    if after_id:
+        stmt += lambda s: s.where(LogEntry.id < after_id)
+    if context_contains:
+        if settings.LOG_CONTEXT_MSGPACK:
+            raise ValueError(
+                "context_contains is not supported while log context is stored as MessagePack"
+            )
+        stmt += lambda s: s.where(
+            type_coerce(LogEntry.context, JSONB).contains(context_contains)
+        )
+
+    # UUIDv7 ids are time-ordered, so this is newest-first via the primary key
+    stmt += lambda s: s.order_by(desc(LogEntry.id)).offset(offset).limit(limit)
+    return stmt
+
+
+def build_log_count_query(
+    column, start_time: Optional[datetime] = None, end_time: Optional[datetime] = None
+) -> StatementLambdaElement:
+    """
+    Build a cached ``SELECT column, COUNT(*) ... GROUP BY column`` for log entries.
+
+    Like `build_log_query`, the optional time bounds are separate lambdas so
+    each filter combination compiles once.
+    """
+    stmt = lambda_stmt(lambda: select(column, func.count()))
+
+    if start_time:
+        stmt += lambda s: s.where(LogEntry.created_at >= start_time)
+    if end_time:
+        stmt += lambda s: s.where(LogEntry.created_at <= end_time)
+
+    stmt += lambda s: s.group_by(column)
+    return stmt
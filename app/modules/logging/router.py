@@ -2,10 +2,13 @@
 Router for the logging module.
 """
 
+import uuid
 from datetime import datetime
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Response
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from app.db.session import get_db
@@ -32,6 +35,13 @@ async def get_log_entries(
     end_time: Optional[str] = Query(None, description="End time (ISO format)"),
     trace_id: Optional[str] = Query(None, description="Filter by trace ID"),
     user_id: Optional[str] = Query(None, description="Filter by user ID"),
+    after_id: Optional[uuid.UUID] = Query(
+        None, description="Return logs older than this log ID (use the last ID of the previous page)"
+    ),
+    context_contains: Optional[str] = Query(
+        None,
+        description='Only logs whose context contains this JSON object, e.g. {"key": "value"} (PostgreSQL only)',
+    ),
     limit: int = Query(100, ge=1, le=1000, description="Maximum number of logs to return"),
     offset: int = Query(0, ge=0, description="Number of logs to skip"),
     db: Session = Depends(get_db),
@@ -43,6 +53,19 @@ async def get_log_entries(
     parsed_start_time = parse_datetime(start_time) if start_time else None
     parsed_end_time = parse_datetime(end_time) if end_time else None
 
+    # Parse the JSON-encoded context filter if provided
+    parsed_context = None
+    if context_contains:
+        try:
+            parsed_context = orjson.loads(context_contains)
+        except orjson.JSONDecodeError:
+            parsed_context = None
+        if not isinstance(parsed_context, dict):
+            raise HTTPException(status_code=400, detail="context_contains must be a JSON object")
+        # JSONB containment (@>) has no equivalent on other databases
+        if db.get_bind().dialect.name != "postgresql":
+            raise HTTPException(status_code=400, detail="context_contains is only supported on PostgreSQL")
+
     # Create query params object
     query_params = LogQueryParams(
         level=level,
@@ -51,15 +74,20 @@ async def get_log_entries(
         end_time=parsed_end_time,
         trace_id=trace_id,
         user_id=user_id,
+        context_contains=parsed_context,
+        after_id=after_id,
         limit=limit,
         offset=offset,
     )
 
-    return await LoggingService.get_log_entries(db, query_params)
+    try:
+        return await LoggingService.get_log_entries(db, query_params)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.get("/{log_id}", response_model=LogEntryResponse)
-async def get_log_entry(log_id: int, db: Session = Depends(get_db)):
+async def get_log_entry(log_id: uuid.UUID, db: Session = Depends(get_db)):
     """
     Get a specific log entry by ID.
     """
@@ -100,17 +128,57 @@ async def export_logs_to_json(
         offset=offset,
     )
 
-    # Export logs to JSON
-    json_data = await LoggingService.export_logs_to_json(db, query_params)
-
-    # Return JSON response
-    return Response(
-        content=json_data,
+    # Stream the exported logs as they are encoded
+    return StreamingResponse(
+        LoggingService.export_logs_to_json(db, query_params),
         media_type="application/json",
         headers={"Content-Disposition": 'attachment; filename="logs.json"'},
     )
 
 
+@router.get("/export/arrow")
+async def export_logs_to_arrow(
+    level: Optional[str] = Query(None, description="Filter by log level"),
+    source: Optional[str] = Query(None, description="Filter by source name"),
+    start_time: Optional[str] = Query(None, description="Start time (ISO format)"),
+    end_time: Optional[str] = Query(None, description="End time (ISO format)"),
+    trace_id: Optional[str] = Query(None, description="Filter by trace ID"),
+    user_id: Optional[str] = Query(None, description="Filter by user ID"),
+    limit: int = Query(1000, ge=1, le=10000, description="Maximum number of logs to export"),
+    offset: int = Query(0, ge=0, description="Number of logs to skip"),
+    db: Session = Depends(get_db),
+):
+    """
+    Export logs as an Apache Arrow IPC stream.
+    """
+    # Parse datetime strings if provided
+    parsed_start_time = parse_datetime(start_time) if start_time else None
+    parsed_end_time = parse_datetime(end_time) if end_time else None
+
+    # Create query params object
+    query_params = LogQueryParams(
+        level=level,
+        source=source,
+        start_time=parsed_start_time,
+        end_time=parsed_end_time,
+        trace_id=trace_id,
+        user_id=user_id,
+        limit=limit,
+        offset=offset,
+    )
+
+    try:
+        batches = LoggingService.export_logs_to_arrow(db, query_params)
+    except ImportError:
+        raise HTTPException(status_code=501, detail="Arrow export requires pyarrow")
+
+    return StreamingResponse(
+        batches,
+        media_type="application/vnd.apache.arrow.stream",
+        headers={"Content-Disposition": 'attachment; filename="logs.arrows"'},
+    )
+
+
 @router.get("/stats/summary")
 async def get_log_statistics(
     start_time: Optional[str] = Query(None, description="Start time (ISO format)"),
@@ -2,16 +2,64 @@
 Service for the logging module.
 """
 
-import json
+import io
+import uuid
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Optional, Sequence
 
-from sqlalchemy import and_, desc
+import orjson
+from sqlalchemy import Row, delete, insert
 from sqlalchemy.orm import Session
 
-from app.modules.logging.models import LogEntry, LogEntryCreate, LogQueryParams
+from app.core.settings import get_settings
+from app.modules.logging.models import (
+    LogEntry,
+    LogEntryCreate,
+    LogEntryResponse,
+    LogLevel,
+    LogQueryParams,
+    build_log_count_query,
+    build_log_query,
+)
 from app.utils.common import json_serializer
 
+settings = get_settings()
+
+# Rows fetched from the cursor per round-trip when exporting logs
+EXPORT_BATCH_SIZE = 1000
+
+# Columns returned by log listings: the fields of LogEntryResponse, plus the
+# MessagePack-stored context it reports as ``context``
+LIST_COLUMNS = tuple(getattr(LogEntry, name) for name in LogEntryResponse.model_fields) + (
+    LogEntry.context_packed,
+)
+
+# Columns included in log exports; selected as plain rows, skipping ORM loading
+EXPORT_COLUMNS = (
+    LogEntry.id,
+    LogEntry.level,
+    LogEntry.source,
+    LogEntry.message,
+    LogEntry.context,
+    LogEntry.trace_id,
+    LogEntry.span_id,
+    LogEntry.user_id,
+    LogEntry.created_at,
+    LogEntry.context_packed,
+)
+
+
+def _export_record(row: Row) -> Dict[str, Any]:
+    """
+    Convert an export row to a dict, reporting MessagePack-stored context as ``context``.
+    """
+    record = row._asdict()
+    packed = record.pop("context_packed")
+    if packed is not None:
+        record["context"] = packed
+    return record
+
 
 class LoggingService:
     """
@@ -30,57 +78,70 @@ class LoggingService:
         Returns:
             Created log entry
         """
-        db_log_entry = LogEntry(
-            level=log_entry.level,
-            source=log_entry.source,
-            message=log_entry.message,
-            context=log_entry.context,
-            trace_id=log_entry.trace_id,
-            span_id=log_entry.span_id,
-            user_id=log_entry.user_id,
-        )
-        db.add(db_log_entry)
+        values = log_entry.model_dump(mode="json")
+        if settings.LOG_CONTEXT_MSGPACK:
+            values["context_packed"] = values.pop("context")
+
+        # INSERT ... RETURNING hands back the server-generated columns in the
+        # same round-trip, so no follow-up SELECT is needed
+        db_log_entry = db.execute(
+            insert(LogEntry)
+            .values(values)
+            .returning(LogEntry)
+        ).scalar_one()
+        # Detach so the commit does not expire the row we already have
+        db.expunge(db_log_entry)
         db.commit()
-        db.refresh(db_log_entry)
         return db_log_entry
 
     @staticmethod
     async def get_log_entries(
         db: Session, query_params: LogQueryParams
-    ) -> List[LogEntry]:
+    ) -> List[Row]:
         """
         Get log entries with filtering.
 
+        Only the columns in the API response are selected, as plain rows
+        rather than ORM objects.
+
         Args:
             db: Database session
             query_params: Query parameters for filtering
 
         Returns:
-            List of log entries
+            List of log entry rows
         """
-        query = db.query(LogEntry)
+        return db.execute(build_log_query(query_params, LIST_COLUMNS)).all()
 
-        if query_params.level:
-            query = query.filter(LogEntry.level == query_params.level)
-        if query_params.source:
-            query = query.filter(LogEntry.source == query_params.source)
-        if query_params.start_time:
-            query = query.filter(LogEntry.created_at >= query_params.start_time)
-        if query_params.end_time:
-            query = query.filter(LogEntry.created_at <= query_params.end_time)
-        if query_params.trace_id:
-            query = query.filter(LogEntry.trace_id == query_params.trace_id)
-        if query_params.user_id:
-            query = query.filter(LogEntry.user_id == query_params.user_id)
+    @staticmethod
+    def iter_log_entries(
+        db: Session,
+        query_params: LogQueryParams,
+        columns: Sequence = EXPORT_COLUMNS,
+    ) -> Iterator[Row]:
+        """
+        Iterate over log entries lazily, for exports.
 
-        query = query.order_by(desc(LogEntry.created_at))
-        query = query.offset(query_params.offset)
-        query = query.limit(query_params.limit)
+        Runs the same query as ``get_log_entries`` but fetches rows from the
+        cursor in batches of ``EXPORT_BATCH_SIZE`` (streamed server-side where
+        the driver supports it), so memory use does not grow with the number
+        of matching entries.
 
-        return query.all()
+        Args:
+            db: Database session
+            query_params: Query parameters for filtering
+            columns: Columns to select
+
+        Yields:
+            Log entry rows
+        """
+        yield from db.execute(
+            build_log_query(query_params, columns),
+            execution_options={"yield_per": EXPORT_BATCH_SIZE},
+        )
 
     @staticmethod
-    async def get_log_entry(db: Session, log_id: int) -> Optional[LogEntry]:
+    async def get_log_entry(db: Session, log_id: uuid.UUID) -> Optional[LogEntry]:
         """
         Get a specific log entry by ID.
 
@@ -91,34 +152,119 @@ class LoggingService:
         Returns:
             Log entry if found, None otherwise
         """
-        return db.query(LogEntry).filter(LogEntry.id == log_id).first()
+        return db.get(LogEntry, log_id)
 
     @staticmethod
-    async def export_logs_to_json(
+    async def delete_log_entries_before(db: Session, cutoff: datetime) -> int:
+        """
+        Delete all log entries created before the cutoff.
+
+        Args:
+            db: Database session
+            cutoff: Entries created before this time are deleted
+
+        Returns:
+            Number of log entries deleted
+        """
+        result = db.execute(
+            delete(LogEntry)
+            .where(LogEntry.created_at < cutoff)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        return result.rowcount
+
+    @staticmethod
+    def export_logs_to_json(
+        db: Session, query_params: LogQueryParams
+    ) -> Iterator[bytes]:
+        """
+        Export logs to JSON format, streaming the encoded array in chunks.
+
+        Rows come from ``iter_log_entries`` and are encoded one at a time,
+        so memory use does not grow with the number of exported entries.
+        This is a plain generator so that
+        ``StreamingResponse`` iterates it in the threadpool and the blocking
+        database reads stay off the event loop.
+
+        Args:
+            db: Database session
+            query_params: Query parameters for filtering
+
+        Yields:
+            Chunks of a JSON array of log entries
+        """
+        yield b"["
+        separator = b""
+        for row in LoggingService.iter_log_entries(db, query_params):
+            yield separator + orjson.dumps(_export_record(row), default=json_serializer)
+            separator = b","
+        yield b"]"
+
+    @staticmethod
+    def export_logs_to_arrow(
         db: Session, query_params: LogQueryParams
-    ) -> str:
+    ) -> Iterator[bytes]:
         """
-        Export logs to JSON format.
+        Export logs as an Apache Arrow IPC stream, one record batch per fetch.
+
+        Rows come from ``iter_log_entries`` and are grouped into batches of
+        ``EXPORT_BATCH_SIZE``; each encoded batch is yielded as soon as it
+        is written. Requires the optional ``pyarrow`` package; the import
+        happens here, before streaming starts, so a missing dependency
+        surfaces as ``ImportError`` to the caller.
 
         Args:
             db: Database session
             query_params: Query parameters for filtering
 
         Returns:
-            JSON string containing log entries
-        """
-        logs = await LoggingService.get_log_entries(db, query_params)
-        return json.dumps([{
-            "id": log.id,
-            "level": log.level,
-            "source": log.source,
-            "message": log.message,
-            "context": log.context,
-            "trace_id": log.trace_id,
-            "span_id": log.span_id,
-            "user_id": log.user_id,
-            "created_at": log.created_at.isoformat(),
-        } for log in logs], default=json_serializer)
+            Iterator over chunks of the Arrow IPC stream
+        """
+        import pyarrow as pa  # Optional dependency, only needed for Arrow export
+
+        schema = pa.schema(
+            [
+                ("id", pa.string()),
+                ("level", pa.string()),
+                ("source", pa.string()),
+                ("message", pa.string()),
+                ("context", pa.string()),  # JSON-encoded
+                ("trace_id", pa.string()),
+                ("span_id", pa.string()),
+                ("user_id", pa.string()),
+                ("created_at", pa.timestamp("us", tz="UTC")),
+            ]
+        )
+        rows = LoggingService.iter_log_entries(db, query_params)
+
+        def stream() -> Iterator[bytes]:
+            sink = io.BytesIO()
+
+            def drain() -> bytes:
+                chunk = sink.getvalue()
+                sink.seek(0)
+                sink.truncate()
+                return chunk
+
+            with pa.ipc.new_stream(sink, schema) as writer:
+                while partition := list(islice(rows, EXPORT_BATCH_SIZE)):
+                    columns = {name: [] for name in schema.names}
+                    for row in partition:
+                        record = _export_record(row)
+                        for name in schema.names:
+                            columns[name].append(record[name])
+                    columns["id"] = [str(value) for value in columns["id"]]
+                    columns["context"] = [
+                        orjson.dumps(value).decode() if value is not None else None
+                        for value in columns["context"]
+                    ]
+                    writer.write_batch(pa.record_batch(columns, schema=schema))
+                    yield drain()
+            # End-of-stream marker (and the schema, if there were no rows)
+            yield drain()
+
+        return stream()
 
     @staticmethod
     async def get_log_statistics(
@@ -135,26 +281,19 @@ class LoggingService:
         Returns:
             Dictionary containing log statistics
         """
-        query = db.query(LogEntry)
-
-        if start_time:
-            query = query.filter(LogEntry.created_at >= start_time)
-        if end_time:
-            query = query.filter(LogEntry.created_at <= end_time)
+        # One grouped scan per dimension instead of a COUNT per level
+        level_rows = db.execute(
+            build_log_count_query(LogEntry.level, start_time, end_time)
+        ).all()
+        level_counts = {level.value: 0 for level in LogLevel}
+        level_counts.update(level_rows)
+        total_count = sum(count for _, count in level_rows)
 
-        total_count = query.count()
-        level_counts = {
-            level: query.filter(LogEntry.level == level).count()
-            for level in ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
-        }
-        source_counts = {
-            source[0]: count
-            for source, count in (
-                db.query(LogEntry.source, db.func.count())
-                .group_by(LogEntry.source)
-                .all()
-            )
-        }
+        source_counts = dict(
+            db.execute(
+                build_log_count_query(LogEntry.source, start_time, end_time)
+            ).all()
+        )
 
         return {
             "total_count": total_count,
@@ -6,12 +6,13 @@ from datetime import datetime
 from enum import Enum
 from typing import Any, Dict, Optional, List
 
-from pydantic import BaseModel, Field
-from sqlalchemy import JSON, Boolean, DateTime, Integer, String, Text, Index
+from pydantic import BaseModel, ConfigDict, Field
+from sqlalchemy import Boolean, DateTime, Integer, String, Text, Index
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.sql import func
 
 from app.db.base_model import BaseModel as DBBaseModel
+from app.db.types import JSONType, enum_type
 
 
 class NotificationType(str, Enum):
@@ -58,25 +59,27 @@ class Notification(DBBaseModel):
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     title: Mapped[str] = mapped_column(String(200), nullable=False)
     message: Mapped[str] = mapped_column(Text, nullable=False)
-    notification_type: Mapped[str] = mapped_column(
-        String(20), nullable=False, default=NotificationType.INFO.value
+    notification_type: Mapped[NotificationType] = mapped_column(
+        enum_type(NotificationType), nullable=False, default=NotificationType.INFO
     )
-    priority: Mapped[str] = mapped_column(
-        String(20), nullable=False, default=NotificationPriority.MEDIUM.value
+    priority: Mapped[NotificationPriority] = mapped_column(
+        enum_type(NotificationPriority), nullable=False, default=NotificationPriority.MEDIUM
     )
-    status: Mapped[str] = mapped_column(
-        String(20), nullable=False, default=NotificationStatus.PENDING.value
+    status: Mapped[NotificationStatus] = mapped_column(
+        enum_type(NotificationStatus), nullable=False, default=NotificationStatus.PENDING
     )
     recipient_id: Mapped[str] = mapped_column(
         String(100), nullable=False, index=True
     )  # User ID or group ID
     recipient_type: Mapped[str] = mapped_column(String(20), nullable=False)  # "user" or "group"
     sender_id: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)  # User ID or system ID
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now(), index=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), index=True)
     delivered_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
     read_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
     expires_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)  # Optional expiration time
-    data: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSON, nullable=True)  # Additional data for the notification
+    data: Mapped[Optional[Dict[str, Any]]] = mapped_column(
+        JSONType, nullable=True
+    )  # Additional data for the notification
     action_url: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)  # Optional URL for action button
 
     # Create indexes for common query patterns
@@ -137,6 +140,8 @@ class NotificationResponse(BaseModel):
     Schema for notification response.
     """
 
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     title: str
     message: str
@@ -153,9 +158,6 @@ class NotificationResponse(BaseModel):
     data: Optional[Dict[str, Any]]
     action_url: Optional[str]
 
-    class Config:
-        orm_mode = True
-
 
 class NotificationBulkCreate(BaseModel):
     """
@@ -9,7 +9,7 @@ from typing import List, Optional
 
 import redis
 from fastapi import BackgroundTasks
-from sqlalchemy import and_, desc, or_
+from sqlalchemy import and_, desc, insert, or_, select
 from sqlalchemy.orm import Session
 
 from app.modules.notifications.models import (
@@ -74,31 +74,40 @@ class NotificationsService:
         Returns:
             List of created notifications
         """
-        created_notifications = []
-
-        for recipient_id in notification.recipient_ids:
-            db_notification = Notification(
-                title=notification.title,
-                message=notification.message,
-                notification_type=notification.notification_type.value,
-                priority=notification.priority.value,
-                recipient_id=recipient_id,
-                recipient_type=notification.recipient_type,
-                sender_id=notification.sender_id,
-                expires_at=notification.expires_at,
-                data=notification.data,
-                action_url=notification.action_url,
-            )
-            db.add(db_notification)
-            created_notifications.append(db_notification)
-
+        if not notification.recipient_ids:
+            return []
+
+        shared = {
+            "title": notification.title,
+            "message": notification.message,
+            "notification_type": notification.notification_type.value,
+            "priority": notification.priority.value,
+            "status": NotificationStatus.PENDING.value,
+            "recipient_type": notification.recipient_type,
+            "sender_id": notification.sender_id,
+            "expires_at": notification.expires_at,
+            "data": notification.data,
+            "action_url": notification.action_url,
+        }
+        rows = [
+            {**shared, "recipient_id": recipient_id}
+            for recipient_id in notification.recipient_ids
+        ]
+
+        # A single multi-row INSERT ... RETURNING; SQLAlchemy pages large
+        # batches into groups of insertmanyvalues_page_size rows
+        ids = db.scalars(
+            insert(Notification).returning(Notification.id, sort_by_parameter_order=True),
+            rows,
+        ).all()
         db.commit()
 
-        # Refresh all notifications
-        for notification in created_notifications:
-            db.refresh(notification)
-
-        return created_notifications
+        # Load the committed rows back with one query instead of a refresh per row
+        return list(
+            db.scalars(
+                select(Notification).where(Notification.id.in_(ids)).order_by(Notification.id)
+            )
+        )
 
     @staticmethod
     async def update_notification(
@@ -122,7 +131,7 @@ class NotificationsService:
             return None
 
         # Update fields
-        update_dict = update_data.dict(exclude_unset=True)
+        update_dict = update_data.model_dump(exclude_unset=True)
         for key, value in update_dict.items():
             setattr(db_notification, key, value)
 
@@ -267,35 +276,32 @@ class NotificationsService:
         Returns:
             List of notifications
         """
-        query = db.query(Notification)
-
-        # Apply filters
+        # Collect the active filters and apply them in a single WHERE
+        filters = []
         if recipient_id:
-            query = query.filter(Notification.recipient_id == recipient_id)
-
+            filters.append(Notification.recipient_id == recipient_id)
         if status:
-            query = query.filter(Notification.status == status.value)
-
+            filters.append(Notification.status == status.value)
         if notification_type:
-            query = query.filter(Notification.notification_type == notification_type)
-
+            filters.append(Notification.notification_type == notification_type)
         if priority:
-            query = query.filter(Notification.priority == priority)
+            filters.append(Notification.priority == priority)
 
         # Filter out expired notifications if not included
         if not include_expired:
             now = datetime.utcnow()
-            query = query.filter(
+            filters.append(
                 or_(Notification.expires_at.is_(None), Notification.expires_at > now)
             )
 
-        # Order by created_at (newest first)
-        query = query.order_by(desc(Notification.created_at))
-
-        # Apply pagination
-        query = query.offset(skip).limit(limit)
-
-        return query.all()
+        stmt = (
+            select(Notification)
+            .where(*filters)
+            .order_by(desc(Notification.created_at))  # Newest first
+            .offset(skip)
+            .limit(limit)
+        )
+        return db.scalars(stmt).all()
 
     @staticmethod
     async def get_unread_count(db: Session, recipient_id: str) -> int:
@@ -6,12 +6,13 @@ from datetime import datetime
 from enum import Enum
 from typing import Any, Dict, Optional
 
-from pydantic import BaseModel, Field
-from sqlalchemy import JSON, Boolean, DateTime, ForeignKey, Integer, String, Text, Index
-from sqlalchemy.orm import Mapped, mapped_column
+from pydantic import BaseModel, ConfigDict, Field
+from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, LargeBinary, String, Text, Index
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 
 from app.db.base_model import BaseModel as DBBaseModel
+from app.db.types import JSONType, enum_type
 
 
 class WebhookEventType(str, Enum):
@@ -62,11 +63,13 @@ class WebhookEndpoint(DBBaseModel):
     url: Mapped[str] = mapped_column(String(500), nullable=False)
     description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     secret: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)  # For HMAC signature verification
-    status: Mapped[str] = mapped_column(String(20), default=WebhookStatus.ACTIVE.value)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now())
-    updated_at: Mapped[datetime] = mapped_column(DateTime, default=func.now(), onupdate=func.now())
+    status: Mapped[WebhookStatus] = mapped_column(enum_type(WebhookStatus), default=WebhookStatus.ACTIVE)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
+    updated_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now())
     created_by: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
-    headers: Mapped[Optional[Dict[str, str]]] = mapped_column(JSON, nullable=True)  # Custom headers to include in requests
+    headers: Mapped[Optional[Dict[str, str]]] = mapped_column(
+        JSONType, nullable=True
+    )  # Custom headers to include in requests
     retry_count: Mapped[int] = mapped_column(Integer, default=3)  # Number of retries for failed webhooks
     timeout_seconds: Mapped[int] = mapped_column(Integer, default=5)  # Timeout for webhook requests
 
@@ -84,15 +87,38 @@ class WebhookSubscription(DBBaseModel):
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     endpoint_id: Mapped[int] = mapped_column(Integer, ForeignKey("webhook_endpoints.id", ondelete="CASCADE"), nullable=False)
     event_type: Mapped[str] = mapped_column(String(50), nullable=False)
-    filter_conditions: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSON, nullable=True)  # Optional conditions for triggering
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now())
+    filter_conditions: Mapped[Optional[Dict[str, Any]]] = mapped_column(
+        JSONType, nullable=True
+    )  # Optional conditions for triggering
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
 
     # Create indexes for common query patterns
     __table_args__ = (
         Index("idx_webhook_subscriptions_endpoint_event", endpoint_id, event_type),
+        # GIN index for JSONB containment (@>) lookups on PostgreSQL only
+        Index(
+            "idx_webhook_subscriptions_filter_gin",
+            filter_conditions,
+            postgresql_using="gin",
+        ).ddl_if(dialect="postgresql"),
     )
 
 
+class WebhookPayload(DBBaseModel):
+    """
+    Model for storing webhook payload bodies, deduplicated by content hash.
+
+    An event fanned out to several endpoints stores its payload once and
+    each delivery references it.
+    """
+
+    __tablename__ = "webhook_payloads"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    digest: Mapped[bytes] = mapped_column(LargeBinary(32), nullable=False, unique=True)  # SHA-256 of the canonical JSON
+    body: Mapped[Dict[str, Any]] = mapped_column(JSONType, nullable=False)
+
+
 class WebhookDelivery(DBBaseModel):
     """
     Model for storing webhook delivery attempts.
@@ -103,22 +129,40 @@ class WebhookDelivery(DBBaseModel):
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     endpoint_id: Mapped[int] = mapped_column(Integer, ForeignKey("webhook_endpoints.id", ondelete="CASCADE"), nullable=False)
     event_type: Mapped[str] = mapped_column(String(50), nullable=False)
-    payload: Mapped[Dict[str, Any]] = mapped_column(JSON, nullable=False)
-    request_headers: Mapped[Optional[Dict[str, str]]] = mapped_column(JSON, nullable=True)
+    payload_id: Mapped[int] = mapped_column(Integer, ForeignKey("webhook_payloads.id"), nullable=False, index=True)
+    # Never loaded implicitly, so listings and counts don't join the payload
+    # bodies; load it with selectinload/joinedload where the body is needed
+    stored_payload: Mapped[WebhookPayload] = relationship(lazy="raise")
+    request_headers: Mapped[Optional[Dict[str, str]]] = mapped_column(JSONType, nullable=True)
     response_status: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     response_body: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     success: Mapped[bool] = mapped_column(Boolean, default=False)
     attempt_count: Mapped[int] = mapped_column(Integer, default=1)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now())
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
     completed_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
     next_retry_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
 
     # Create indexes for common query patterns
     __table_args__ = (
-        Index("idx_webhook_deliveries_success", success),
+        # Delivery history per endpoint, e.g. the latest failures, newest first
+        Index(
+            "idx_webhook_deliveries_endpoint_success_created",
+            endpoint_id,
+            success,
+            created_at.desc(),
+        ),
         Index("idx_webhook_deliveries_next_retry", next_retry_at),
     )
 
+    @property
+    def payload(self) -> Dict[str, Any]:
+        """
+        Payload body sent with this delivery.
+
+        Requires ``stored_payload`` to have been loaded with the delivery.
+        """
+        return self.stored_payload.body
+
 
 class WebhookEvent(DBBaseModel):
     """
@@ -128,7 +172,7 @@ class WebhookEvent(DBBaseModel):
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     event_type: Mapped[str] = mapped_column(String(100), index=True, nullable=False)
-    payload: Mapped[Dict[str, Any]] = mapped_column(JSON, nullable=False)
+    payload: Mapped[Dict[str, Any]] = mapped_column(JSONType, nullable=False)
     status: Mapped[str] = mapped_column(String(20), nullable=False, default="pending")
     target_url: Mapped[str] = mapped_column(String(500), nullable=False)
     retry_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
@@ -137,13 +181,16 @@ class WebhookEvent(DBBaseModel):
     response_code: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     response_body: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     error_message: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now(), index=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), index=True)
 
     # Create indexes for common query patterns
+    # Dispatchers poll with
+    #   WHERE status IN (...) AND next_retry <= now() ORDER BY next_retry
+    #   FOR UPDATE SKIP LOCKED
+    # so the equality column leads and the range/sort column follows
     __table_args__ = (
-        Index("idx_webhook_events_status", "status"),
+        Index("idx_webhook_events_status_next_retry", "status", "next_retry"),
         Index("idx_webhook_events_event_type", "event_type"),
-        Index("idx_webhook_events_next_retry", "next_retry"),
     )
 
 
@@ -191,6 +238,8 @@ class WebhookEndpointResponse(BaseModel):
     Schema for webhook endpoint response.
     """
 
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     name: str
     url: str
@@ -203,30 +252,28 @@ class WebhookEndpointResponse(BaseModel):
     retry_count: int
     timeout_seconds: int
 
-    class Config:
-        orm_mode = True
-
 
 class WebhookSubscriptionResponse(BaseModel):
     """
     Schema for webhook subscription response.
     """
 
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     endpoint_id: int
     event_type: str
     filter_conditions: Optional[Dict[str, Any]] = None
     created_at: datetime
 
-    class Config:
-        orm_mode = True
-
 
 class WebhookDeliveryResponse(BaseModel):
     """
     Schema for webhook delivery response.
     """
 
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     endpoint_id: int
     event_type: str
@@ -238,9 +285,6 @@ class WebhookDeliveryResponse(BaseModel):
     completed_at: Optional[datetime] = None
     next_retry_at: Optional[datetime] = None
 
-    class Config:
-        orm_mode = True
-
 
 class WebhookTestRequest(BaseModel):
     """
@@ -277,6 +321,9 @@ class WebhookEventResponse(BaseModel):
     """
     Schema for webhook event response.
     """
+
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     event_type: str
     payload: Dict[str, Any]
@@ -289,6 +336,3 @@ class WebhookEventResponse(BaseModel):
     response_body: Optional[str]
     error_message: Optional[str]
     created_at: datetime
-
-    class Config:
-        orm_mode = True
@@ -216,5 +216,5 @@ async def retry_failed_deliveries(db: Session = Depends(get_db)):
     retry_count = await WebhooksService.retry_failed_deliveries(db)
     return {
         "retry_count": retry_count,
-        "message": f"Queued {retry_count} failed deliveries for retry",
+        "message": f"Retried {retry_count} failed deliveries",
     }
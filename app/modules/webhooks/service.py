@@ -5,22 +5,25 @@ Service for the webhooks module.
 import asyncio
 import hashlib
 import hmac
-import json
 import logging
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional
 
 import httpx
+import orjson
 from fastapi import BackgroundTasks
-from sqlalchemy import and_, desc, or_
-from sqlalchemy.orm import Session
+from sqlalchemy import and_, desc, insert, or_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, joinedload, selectinload
 
+from app.db.session import SessionLocal
 from app.modules.webhooks.models import (
     WebhookDelivery,
     WebhookEndpoint,
     WebhookEndpointCreate,
     WebhookEndpointUpdate,
     WebhookEventType,
+    WebhookPayload,
     WebhookStatus,
     WebhookSubscription,
     WebhookSubscriptionCreate,
@@ -29,6 +32,12 @@ from app.utils.common import json_serializer
 
 logger = logging.getLogger(__name__)
 
+# Failed deliveries claimed per retry poll
+RETRY_BATCH_SIZE = 100
+
+# Retries sent concurrently within one poll
+RETRY_CONCURRENCY = 10
+
 
 class WebhooksService:
     """
@@ -86,7 +95,7 @@ class WebhooksService:
         if not db_endpoint:
             return None
 
-        update_data = endpoint_update.dict(exclude_unset=True)
+        update_data = endpoint_update.model_dump(exclude_unset=True)
 
         # Convert Pydantic HttpUrl to string if present
         if "url" in update_data and update_data["url"]:
@@ -323,12 +332,45 @@ class WebhooksService:
         return formatted_results
 
     @staticmethod
-    def _generate_signature(payload: Dict[str, Any], secret: str) -> str:
+    def _store_payload(db: Session, payload: Dict[str, Any]) -> int:
         """
-        Generate HMAC signature for webhook payload.
+        Store a webhook payload once per distinct content.
 
         Args:
+            db: Database session
             payload: Webhook payload
+
+        Returns:
+            ID of the stored payload
+        """
+        canonical = orjson.dumps(
+            payload, default=json_serializer, option=orjson.OPT_SORT_KEYS
+        )
+        digest = hashlib.sha256(canonical).digest()
+
+        lookup = select(WebhookPayload.id).where(WebhookPayload.digest == digest)
+        payload_id = db.scalar(lookup)
+        if payload_id is None:
+            try:
+                with db.begin_nested():
+                    payload_id = db.scalar(
+                        insert(WebhookPayload)
+                        .values(digest=digest, body=payload)
+                        .returning(WebhookPayload.id)
+                    )
+            except IntegrityError:
+                # Stored concurrently by another writer
+                payload_id = db.scalar(lookup)
+
+        return payload_id
+
+    @staticmethod
+    def _generate_signature(body: bytes, secret: str) -> str:
+        """
+        Generate HMAC signature for a webhook request body.
+
+        Args:
+            body: Encoded request body, exactly as sent
             secret: Secret key for HMAC
 
         Returns:
@@ -337,15 +379,8 @@ class WebhooksService:
         if not secret:
             return ""
 
-        # Convert payload to JSON string
-        payload_str = json.dumps(payload, default=json_serializer)
-
-        # Generate HMAC signature
-        signature = hmac.new(
-            secret.encode(), payload_str.encode(), hashlib.sha256
-        ).hexdigest()
-
-        return signature
+        # One-shot HMAC runs entirely inside OpenSSL
+        return hmac.digest(secret.encode(), body, "sha256").hex()
 
     @staticmethod
     async def _deliver_webhook(
@@ -389,13 +424,17 @@ class WebhooksService:
             else:
                 # Create new delivery record if ID not found
                 db_delivery = WebhookDelivery(
-                    endpoint_id=endpoint_id, event_type=event_type, payload=payload
+                    endpoint_id=endpoint_id,
+                    event_type=event_type,
+                    payload_id=WebhooksService._store_payload(db, payload),
                 )
                 db.add(db_delivery)
         else:
             # Create new delivery record
             db_delivery = WebhookDelivery(
-                endpoint_id=endpoint_id, event_type=event_type, payload=payload
+                endpoint_id=endpoint_id,
+                event_type=event_type,
+                payload_id=WebhooksService._store_payload(db, payload),
             )
             db.add(db_delivery)
 
@@ -414,9 +453,12 @@ class WebhooksService:
         if headers:
             request_headers.update(headers)
 
+        # Encode the body once so the signature covers the exact bytes sent
+        body = orjson.dumps(payload, default=json_serializer)
+
         # Add signature if secret is provided
         if secret:
-            signature = WebhooksService._generate_signature(payload, secret)
+            signature = WebhooksService._generate_signature(body, secret)
             request_headers["X-Webhook-Signature"] = signature
 
         # Store request headers
@@ -428,7 +470,7 @@ class WebhooksService:
             async with httpx.AsyncClient() as client:
                 response = await client.post(
                     endpoint_url,
-                    json=payload,
+                    content=body,
                     headers=request_headers,
                     timeout=timeout_seconds,
                 )
@@ -490,6 +532,7 @@ class WebhooksService:
         endpoints = await WebhooksService.get_endpoints_for_event(db, event_type)
 
         delivery_ids = []
+        payload_id = None
         for endpoint_data in endpoints:
             endpoint = endpoint_data["endpoint"]
             subscription = endpoint_data["subscription"]
@@ -506,9 +549,15 @@ class WebhooksService:
                 if not match:
                     continue
 
+            # Store the payload once, shared by every delivery of this event
+            if payload_id is None:
+                payload_id = WebhooksService._store_payload(db, payload)
+
             # Create delivery record
             db_delivery = WebhookDelivery(
-                endpoint_id=endpoint["id"], event_type=event_type.value, payload=payload
+                endpoint_id=endpoint["id"],
+                event_type=event_type.value,
+                payload_id=payload_id,
             )
             db.add(db_delivery)
             db.commit()
@@ -533,61 +582,56 @@ class WebhooksService:
         return delivery_ids
 
     @staticmethod
-    async def retry_failed_deliveries(db: Session) -> int:
+    async def retry_failed_deliveries(db: Session, batch_size: int = RETRY_BATCH_SIZE) -> int:
         """
         Retry failed webhook deliveries.
 
+        Up to ``batch_size`` due deliveries are claimed in one transaction,
+        then sent with at most ``RETRY_CONCURRENCY`` requests in flight.
+        Each retry runs in its own session on the same bind, so concurrent
+        commits don't interleave on ``db``, and all retries finish before
+        this returns, so none outlive the caller's session.
+
         Args:
             db: Database session
+            batch_size: Maximum number of deliveries to claim
 
         Returns:
-            Number of deliveries queued for retry
+            Number of deliveries retried
         """
-        # Get failed deliveries that are due for retry
+        # Claim failed deliveries that are due for retry. SKIP LOCKED lets
+        # several schedulers poll concurrently without claiming the same rows.
         now = datetime.utcnow()
-        failed_deliveries = (
-            db.query(WebhookDelivery)
+        due_deliveries = db.execute(
+            select(WebhookDelivery, WebhookEndpoint)
             .join(WebhookEndpoint, WebhookDelivery.endpoint_id == WebhookEndpoint.id)
-            .filter(
-                and_(
-                    WebhookDelivery.success is False,
-                    WebhookDelivery.attempt_count < WebhookEndpoint.retry_count,
-                    or_(
-                        WebhookDelivery.next_retry_at.is_(None),
-                        WebhookDelivery.next_retry_at <= now,
-                    ),
-                    WebhookEndpoint.status == WebhookStatus.ACTIVE.value,
-                )
-            )
-            .all()
-        )
-
-        retry_count = 0
-        for delivery in failed_deliveries:
-            # Get endpoint details
-            endpoint = (
-                db.query(WebhookEndpoint)
-                .filter(WebhookEndpoint.id == delivery.endpoint_id)
-                .first()
+            .where(
+                WebhookDelivery.success.is_(False),
+                WebhookDelivery.attempt_count < WebhookEndpoint.retry_count,
+                or_(
+                    WebhookDelivery.next_retry_at.is_(None),
+                    WebhookDelivery.next_retry_at <= now,
+                ),
+                WebhookEndpoint.status == WebhookStatus.ACTIVE.value,
             )
-            if not endpoint:
-                continue
-
+            .order_by(WebhookDelivery.next_retry_at)
+            .options(selectinload(WebhookDelivery.stored_payload))
+            .limit(batch_size)
+            .with_for_update(of=WebhookDelivery, skip_locked=True)
+        ).all()
+
+        retries = []
+        for delivery, endpoint in due_deliveries:
             # Calculate next retry time with exponential backoff
             backoff_factor = min(
                 delivery.attempt_count, 5
             )  # Cap at 5 to avoid excessive delays
             retry_delay = 60 * (2**backoff_factor)  # Exponential backoff in seconds
-            next_retry = now + timedelta(seconds=retry_delay)
+            delivery.next_retry_at = now + timedelta(seconds=retry_delay)
 
-            # Update next retry time
-            delivery.next_retry_at = next_retry
-            db.commit()
-
-            # Schedule retry in background
-            asyncio.create_task(
-                WebhooksService._deliver_webhook(
-                    db,
+            # Capture what the retry needs before the commit expires the rows
+            retries.append(
+                (
                     endpoint.id,
                     delivery.event_type,
                     delivery.payload,
@@ -599,9 +643,23 @@ class WebhooksService:
                 )
             )
 
-            retry_count += 1
+        # Commit all claims at once, releasing the row locks
+        db.commit()
+
+        bind = db.get_bind()
+        semaphore = asyncio.Semaphore(RETRY_CONCURRENCY)
+
+        async def retry(args) -> None:
+            async with semaphore:
+                with SessionLocal(bind=bind) as retry_db:
+                    await WebhooksService._deliver_webhook(retry_db, *args)
+
+        results = await asyncio.gather(*(retry(args) for args in retries), return_exceptions=True)
+        for args, result in zip(retries, results):
+            if isinstance(result, Exception):
+                logger.error(f"Webhook retry error: ID={args[-1]}, Error={str(result)}")
 
-        return retry_count
+        return len(retries)
 
     @staticmethod
     async def test_webhook(
@@ -641,6 +699,8 @@ class WebhooksService:
             endpoint.secret,
             endpoint.timeout_seconds,
         )
+        # The response includes the payload body
+        db.refresh(delivery, ["stored_payload"])
 
         return delivery
 
@@ -657,7 +717,10 @@ class WebhooksService:
             Webhook delivery if found, None otherwise
         """
         return (
-            db.query(WebhookDelivery).filter(WebhookDelivery.id == delivery_id).first()
+            db.query(WebhookDelivery)
+            .options(joinedload(WebhookDelivery.stored_payload))
+            .filter(WebhookDelivery.id == delivery_id)
+            .first()
         )
 
     @staticmethod
@@ -683,20 +746,21 @@ class WebhooksService:
         Returns:
             List of webhook deliveries
         """
-        query = db.query(WebhookDelivery)
-
+        # Collect the active filters and apply them in a single WHERE
+        filters = []
         if endpoint_id:
-            query = query.filter(WebhookDelivery.endpoint_id == endpoint_id)
-
+            filters.append(WebhookDelivery.endpoint_id == endpoint_id)
         if event_type:
-            query = query.filter(WebhookDelivery.event_type == event_type)
-
+            filters.append(WebhookDelivery.event_type == event_type)
         if success is not None:
-            query = query.filter(WebhookDelivery.success == success)
+            filters.append(WebhookDelivery.success == success)
 
-        return (
-            query.order_by(desc(WebhookDelivery.created_at))
+        stmt = (
+            select(WebhookDelivery)
+            .where(*filters)
+            .options(selectinload(WebhookDelivery.stored_payload))
+            .order_by(desc(WebhookDelivery.created_at))
             .offset(skip)
             .limit(limit)
-            .all()
         )
+        return db.scalars(stmt).all()
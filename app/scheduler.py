@@ -13,7 +13,7 @@ import logging
 import sys
 from datetime import datetime, timedelta
 
-from app.db.session import SessionLocal
+from app.db.session import db_session
 from app.modules.logging.service import LoggingService
 from app.modules.notifications.service import NotificationsService
 from app.modules.webhooks.service import WebhooksService
@@ -29,27 +29,23 @@ logger = logging.getLogger(__name__)
 async def clean_expired_notifications():
     """Clean up expired notifications."""
     logger.info("Starting cleanup of expired notifications")
-    db = SessionLocal()
-    try:
-        count = await NotificationsService.clean_expired_notifications(db)
-        logger.info(f"Deleted {count} expired notifications")
-    except Exception as e:
-        logger.error(f"Error cleaning up expired notifications: {e}")
-    finally:
-        db.close()
+    with db_session() as db:
+        try:
+            count = await NotificationsService.clean_expired_notifications(db)
+            logger.info(f"Deleted {count} expired notifications")
+        except Exception as e:
+            logger.error(f"Error cleaning up expired notifications: {e}")
 
 
 async def retry_failed_webhooks():
     """Retry failed webhook deliveries."""
     logger.info("Starting retry of failed webhook deliveries")
-    db = SessionLocal()
-    try:
-        count = await WebhooksService.retry_failed_deliveries(db)
-        logger.info(f"Queued {count} failed webhook deliveries for retry")
-    except Exception as e:
-        logger.error(f"Error retrying failed webhook deliveries: {e}")
-    finally:
-        db.close()
+    with db_session() as db:
+        try:
+            count = await WebhooksService.retry_failed_deliveries(db)
+            logger.info(f"Retried {count} failed webhook deliveries")
+        except Exception as e:
+            logger.error(f"Error retrying failed webhook deliveries: {e}")
 
 
 async def prune_old_logs(days: int = 30):
@@ -60,30 +56,15 @@ async def prune_old_logs(days: int = 30):
         days: Number of days to keep logs for
     """
     logger.info(f"Starting pruning of logs older than {days} days")
-    db = SessionLocal()
-    try:
-        cutoff_date = datetime.utcnow() - timedelta(days=days)
-
-        # Create query params with the cutoff date
-        from app.modules.logging.models import LogQueryParams
-
-        query_params = LogQueryParams(
-            end_time=cutoff_date, limit=10000  # Set a high limit to delete in batches
-        )
-
-        # Get old logs
-        old_logs = await LoggingService.get_log_entries(db, query_params)
-
-        # Delete old logs
-        for log in old_logs:
-            db.delete(log)
-
-        db.commit()
-        logger.info(f"Deleted {len(old_logs)} log entries older than {days} days")
-    except Exception as e:
-        logger.error(f"Error pruning old logs: {e}")
-    finally:
-        db.close()
+    with db_session() as db:
+        try:
+            cutoff_date = datetime.utcnow() - timedelta(days=days)
+
+            # Delete old logs with a single range DELETE on the indexed created_at
+            count = await LoggingService.delete_log_entries_before(db, cutoff_date)
+            logger.info(f"Deleted {count} log entries older than {days} days")
+        except Exception as e:
+            logger.error(f"Error pruning old logs: {e}")
 
 
 async def run_all_tasks(log_retention_days: int = 30):
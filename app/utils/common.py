@@ -1,7 +1,55 @@
-import json
+import os
+import threading
+import time
+import uuid
 from datetime import datetime
+from functools import lru_cache
 from typing import Any, Optional
 
+import orjson
+
+
+_uuid7_lock = threading.Lock()
+_uuid7_last_ms = 0
+_uuid7_counter = 0
+
+
+def uuid7() -> uuid.UUID:
+    """
+    Generate a time-ordered UUID (version 7, RFC 9562).
+
+    The leading 48 bits are the Unix timestamp in milliseconds, so values
+    generated later sort later, keeping B-tree inserts at the right edge
+    without a shared sequence. Within one millisecond the 12-bit rand_a
+    field is used as a counter (RFC 9562 method 1), so values generated
+    by this process are strictly increasing.
+    """
+    global _uuid7_last_ms, _uuid7_counter
+
+    with _uuid7_lock:
+        timestamp_ms = time.time_ns() // 1_000_000
+        if timestamp_ms > _uuid7_last_ms:
+            _uuid7_last_ms = timestamp_ms
+            _uuid7_counter = int.from_bytes(os.urandom(2), "big") & 0x7FF  # Leave headroom
+        else:
+            _uuid7_counter += 1
+            if _uuid7_counter > 0xFFF:
+                # Counter exhausted: borrow the next millisecond
+                _uuid7_last_ms += 1
+                _uuid7_counter = 0
+            timestamp_ms = _uuid7_last_ms
+        counter = _uuid7_counter
+
+    rand = int.from_bytes(os.urandom(8), "big")
+    value = (
+        (timestamp_ms & 0xFFFF_FFFF_FFFF) << 80
+        | 0x7 << 76  # version
+        | counter << 64  # rand_a, used as a counter
+        | 0b10 << 62  # variant
+        | rand & 0x3FFF_FFFF_FFFF_FFFF  # rand_b
+    )
+    return uuid.UUID(int=value)
+
 
 def serialize_datetime(obj: Any) -> Any:
     """
@@ -16,7 +64,9 @@ def json_dumps(obj: Any) -> str:
     """
     Serialize object to JSON string, handling datetime objects.
     """
-    return json.dumps(obj, default=serialize_datetime)
+    return orjson.dumps(
+        obj, default=serialize_datetime, option=orjson.OPT_NON_STR_KEYS
+    ).decode()
 
 
 def json_serializer(obj: Any) -> Any:
@@ -26,6 +76,8 @@ def json_serializer(obj: Any) -> Any:
     """
     if isinstance(obj, datetime):
         return obj.isoformat()
+    if isinstance(obj, uuid.UUID):
+        return str(obj)
     raise TypeError(f"Type {type(obj)} not serializable")
 
 
@@ -34,32 +86,48 @@ def safe_parse_json(json_str: str, default: Any = None) -> Any:
     Safely parse JSON string, returning default value if parsing fails.
     """
     try:
-        return json.loads(json_str)
-    except (json.JSONDecodeError, TypeError):
+        return orjson.loads(json_str)
+    except (orjson.JSONDecodeError, TypeError):
         return default if default is not None else {}
 
 
 def get_client_ip(request) -> str:
     """
     Extract client IP address from request.
+
+    The result is cached on ``request.state`` so repeated calls while
+    handling the same request don't re-parse the headers.
     """
+    client_ip = getattr(request.state, "client_ip", None)
+    if client_ip is not None:
+        return client_ip
+
     x_forwarded_for = request.headers.get("X-Forwarded-For")
     if x_forwarded_for:
         # Get the client's IP (first in the list)
-        return x_forwarded_for.split(",")[0].strip()
-    return request.client.host if request.client else "unknown"
+        client_ip = x_forwarded_for.partition(",")[0].strip()
+    else:
+        client_ip = request.client.host if request.client else "unknown"
 
+    request.state.client_ip = client_ip
+    return client_ip
 
+
+@lru_cache(maxsize=1024)
 def parse_datetime(date_str: Optional[str]) -> Optional[datetime]:
     """
     Parse a datetime string into a datetime object.
-    Supports ISO format and common date formats.
+    Supports ISO 8601 format, including a trailing 'Z' for UTC.
     Returns None if the input is None or invalid.
     """
     if not date_str:
         return None
-    
+
+    # fromisoformat only accepts a trailing 'Z' from Python 3.11
+    if date_str.endswith("Z"):
+        date_str = date_str[:-1] + "+00:00"
+
     try:
-        return datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-    except (ValueError, AttributeError):
+        return datetime.fromisoformat(date_str)
+    except (ValueError, TypeError):
         return None
@@ -3,17 +3,17 @@ Test configuration and fixtures.
 """
 
 import asyncio
-import json
 import os
 from typing import AsyncGenerator, Generator
 
+import orjson
 import pytest
 import pytest_asyncio
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine, event
 from sqlalchemy.engine import Engine
-from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.orm import Session
 from sqlalchemy.pool import StaticPool
 
 from app.core.settings import get_settings
@@ -34,11 +34,17 @@ os.environ["TESTING"] = "1"
 
 settings = get_settings()
 
-# Enable SQLite foreign key support
+# Enable SQLite foreign key support and faster, test-only durability settings.
+# WAL needs a file-backed database; on :memory: it is a harmless no-op.
 @event.listens_for(Engine, "connect")
 def set_sqlite_pragma(dbapi_connection, connection_record):
     cursor = dbapi_connection.cursor()
     cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA cache_size=-200000")
+    cursor.execute("PRAGMA mmap_size=268435456")
     cursor.close()
 
 # Create test engine with SQLite
@@ -46,54 +52,75 @@ engine = create_engine(
     settings.TEST_DATABASE_URL,
     connect_args={"check_same_thread": False},
     poolclass=StaticPool,
-    json_serializer=lambda obj: json.dumps(obj, ensure_ascii=False),
-    json_deserializer=lambda obj: json.loads(obj),
+    json_serializer=lambda obj: orjson.dumps(obj).decode(),
+    json_deserializer=orjson.loads,
 )
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
-@pytest.fixture(scope="function")
-def db_session() -> Generator:
-    """Create a fresh database session for each test."""
-    # Drop all tables
-    Base.metadata.drop_all(bind=engine)
-    # Create all tables
+# pysqlite defers BEGIN and interferes with SAVEPOINT; let SQLAlchemy emit it
+@event.listens_for(engine, "connect")
+def set_sqlite_autocommit(dbapi_connection, connection_record):
+    dbapi_connection.isolation_level = None
+
+
+@event.listens_for(engine, "begin")
+def emit_sqlite_begin(connection):
+    connection.exec_driver_sql("BEGIN")
+
+
+@pytest.fixture(scope="session")
+def db_schema() -> Generator:
+    """Create all tables once for the test session."""
     Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
 
-    session = TestingSessionLocal()
+@pytest.fixture(scope="function")
+def db_session(db_schema) -> Generator:
+    """
+    Create a database session that is rolled back after each test.
+
+    The session runs inside an outer transaction; commits made by the code
+    under test only release a SAVEPOINT, so nothing outlives the test.
+    """
+    connection = engine.connect()
+    transaction = connection.begin()
+    session = Session(
+        bind=connection,
+        autoflush=False,
+        join_transaction_mode="create_savepoint",
+    )
     try:
         yield session
     finally:
         session.close()
-        # Drop all tables after the test
-        Base.metadata.drop_all(bind=engine)
+        transaction.rollback()
+        connection.close()
 
 
-@pytest.fixture(scope="function")
+@pytest.fixture(scope="session")
 def test_app() -> FastAPI:
-    """Create a test instance of the FastAPI application."""
+    """Return the FastAPI application under test."""
     return app
 
 
-@pytest.fixture(scope="function")
-def client(test_app: FastAPI, db_session: Session) -> Generator:
-    """Create a test client with a fresh database session."""
-
-    def override_get_db():
-        try:
-            yield db_session
-        finally:
-            pass
-
-    test_app.dependency_overrides = {}
-    test_app.dependency_overrides[get_db] = override_get_db
+@pytest.fixture(scope="session")
+def app_client(test_app: FastAPI) -> Generator:
+    """Create one test client, running the app lifespan once per session."""
     with TestClient(test_app) as test_client:
         yield test_client
 
 
-# Add pytest-asyncio mark to all async tests
-def pytest_collection_modifyitems(items):
-    """Add pytest.mark.asyncio to all async test functions."""
-    for item in items:
-        if item.get_closest_marker("asyncio") is None:
-            item.add_marker(pytest.mark.asyncio)
+@pytest.fixture(scope="function")
+def client(app_client: TestClient, db_session: Session) -> Generator:
+    """Return the shared test client bound to this test's database session."""
+
+    def override_get_db():
+        yield db_session
+
+    app_client.app.dependency_overrides[get_db] = override_get_db
+    try:
+        yield app_client
+    finally:
+        app_client.app.dependency_overrides.clear()
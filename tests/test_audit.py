@@ -0,0 +1,54 @@
+"""
+Tests for the audit module.
+"""
+
+import uuid
+from datetime import datetime
+from decimal import Decimal
+
+from app.modules.audit.models import AuditLog, AuditLogCreate
+from app.modules.audit.service import AuditService
+
+
+async def test_create_audit_log_diff(db_session):
+    """Test that only changed fields are stored in the diff."""
+    audit_data = AuditLogCreate(
+        actor_id="user123",
+        event_type="config_update",
+        resource_type="config",
+        resource_id="app.name",
+        action="update",
+        old_value={"value": "old", "version": 1},
+        new_value={"value": "new", "version": 1},
+    )
+
+    audit_log = await AuditService.create_audit_log(db_session, audit_data)
+
+    assert audit_log.diff == {"value": {"old": "old", "new": "new"}}
+
+
+async def test_create_audit_log_non_json_values(db_session):
+    """Test that datetime, Decimal and UUID values are stored as JSON."""
+    old_time = datetime(2024, 1, 1, 12, 0, 0)
+    new_time = datetime(2024, 1, 2, 12, 0, 0)
+    request_id = uuid.uuid4()
+    audit_data = AuditLogCreate(
+        actor_id="user123",
+        event_type="config_update",
+        resource_type="config",
+        resource_id="billing.rate",
+        action="update",
+        old_value={"expires_at": old_time, "rate": Decimal("1.50")},
+        new_value={"expires_at": new_time, "rate": Decimal("1.75")},
+        event_metadata={"request_id": request_id},
+    )
+
+    audit_log = await AuditService.create_audit_log(db_session, audit_data)
+    db_session.expire_all()
+
+    db_audit_log = db_session.get(AuditLog, audit_log.id)
+    assert db_audit_log.diff == {
+        "expires_at": {"old": old_time.isoformat(), "new": new_time.isoformat()},
+        "rate": {"old": "1.50", "new": "1.75"},
+    }
+    assert db_audit_log.event_metadata == {"request_id": str(request_id)}
@@ -2,18 +2,31 @@
 Tests for the logging module.
 """
 
-import json
-from datetime import datetime, timedelta
+import csv
+import io
+import os
+import uuid
+from datetime import datetime, timedelta, timezone
 
+import orjson
 import pytest
+from sqlalchemy import insert
+from sqlalchemy.dialects import postgresql
 
 from app.core.settings import get_settings
-from app.modules.logging.models import LogEntry, LogEntryCreate, LogLevel, LogQueryParams
+from app.db.types import MsgPackType
+from app.modules.logging import models as logging_models
+from app.modules.logging.models import LogEntry, LogEntryCreate, LogLevel, LogQueryParams, build_log_query
 from app.modules.logging.service import LoggingService
+from app.utils.common import uuid7
 
+API_V1 = get_settings().API_V1_STR
 
-@pytest.mark.asyncio
-async def test_create_log_entry(client, db_session):
+# Largest page the export endpoint allows
+LARGE_EXPORT_ROWS = 10_000
+
+
+def test_create_log_entry(client, db_session):
     """Test creating a log entry."""
     # Create log entry data
     log_data = {
@@ -24,7 +37,7 @@ async def test_create_log_entry(client, db_session):
     }
 
     # Send request
-    response = client.post(f"{get_settings().API_V1_STR}/logs/", json=log_data)
+    response = client.post(f"{API_V1}/logs/", json=log_data)
 
     # Check response
     assert response.status_code == 201
@@ -35,112 +48,143 @@ async def test_create_log_entry(client, db_session):
     assert data["context"] == log_data["context"]
 
     # Check database
-    db_log = db_session.query(LogEntry).filter(LogEntry.id == data["id"]).first()
+    db_log = db_session.get(LogEntry, uuid.UUID(data["id"]))
     assert db_log is not None
     assert db_log.level == log_data["level"]
     assert db_log.message == log_data["message"]
 
 
-@pytest.mark.asyncio
-async def test_get_log_entries(client, db_session):
-    """Test getting log entries."""
-    # Create test log entries
-    for i in range(3):
-        log_entry = LogEntry(
-            level=LogLevel.INFO.value,
-            message=f"Test message {i}",
-            source="test_service",
-            context={"test_key": f"test_value_{i}"},
-        )
-        db_session.add(log_entry)
+def test_create_log_entry_ip_address(client):
+    """Test that ip_address must be a valid IP address."""
+    log_data = {"level": "INFO", "message": "Test log message", "source": "test_service"}
+
+    response = client.post(f"{API_V1}/logs/", json={**log_data, "ip_address": "unknown"})
+    assert response.status_code == 422
+
+    response = client.post(f"{API_V1}/logs/", json={**log_data, "ip_address": "2001:db8::1"})
+    assert response.status_code == 201
+    assert response.json()["ip_address"] == "2001:db8::1"
+
+
+@pytest.fixture
+def seeded_logs(db_session):
+    """
+    Seed one old log entry and one recent entry per level in a single executemany.
+
+    Shared by the list, filter, time-range and export tests; the rows are
+    rolled back with the test's SAVEPOINT.
+    """
+    now = datetime.now(timezone.utc)
+    yesterday = now - timedelta(days=1)
+    levels = [LogLevel.INFO.value, LogLevel.WARNING.value, LogLevel.ERROR.value]
+    rows = [
+        {
+            "level": LogLevel.INFO.value,
+            "message": "Old log message",
+            "source": "test_service",
+            "context": {"test_key": "old_value"},
+            "created_at": yesterday,
+        }
+    ] + [
+        {
+            "level": level,
+            "message": f"Test message {i}",
+            "source": "test_service",
+            "context": {"test_key": f"test_value_{i}"},
+            "created_at": now,
+        }
+        for i, level in enumerate(levels)
+    ]
+    db_session.execute(insert(LogEntry), rows)
     db_session.commit()
+    return rows
 
+
+def test_get_log_entries(client, seeded_logs):
+    """Test getting log entries."""
     # Send request
-    response = client.get(f"{get_settings().API_V1_STR}/logs/")
+    response = client.get(f"{API_V1}/logs/")
 
     # Check response
     assert response.status_code == 200
     data = response.json()
-    assert len(data) == 3
+    assert len(data) == len(seeded_logs)
     assert data[0]["source"] == "test_service"
+    assert data[0]["message"] == "Test message 2"
+    assert data[0]["context"] == {"test_key": "test_value_2"}
 
 
-@pytest.mark.asyncio
-async def test_get_log_entries_with_filters(client, db_session):
+@pytest.mark.parametrize(
+    "level, expected_count",
+    [("INFO", 2), ("WARNING", 1), ("ERROR", 1), ("CRITICAL", 0)],
+)
+def test_get_log_entries_with_filters(client, seeded_logs, level, expected_count):
     """Test getting log entries with filters."""
-    # Create test log entries with different levels
-    levels = [LogLevel.INFO.value, LogLevel.WARNING.value, LogLevel.ERROR.value]
-    for i, level in enumerate(levels):
-        log_entry = LogEntry(
-            level=level,
-            message=f"Test message {i}",
-            source="test_service",
-            context={"test_key": f"test_value_{i}"},
-        )
-        db_session.add(log_entry)
-    db_session.commit()
-
     # Send request with level filter
-    response = client.get(f"{get_settings().API_V1_STR}/logs/?level=WARNING")
+    response = client.get(f"{API_V1}/logs/?level={level}")
 
     # Check response
     assert response.status_code == 200
     data = response.json()
-    assert len(data) == 1
-    assert data[0]["level"] == "WARNING"
+    assert len(data) == expected_count
+    assert all(entry["level"] == level for entry in data)
 
 
-@pytest.mark.asyncio
-async def test_get_log_entries_with_time_range(client, db_session):
-    """Test getting log entries within a time range."""
-    # Create test log entry from yesterday
-    yesterday = datetime.utcnow() - timedelta(days=1)
-    old_log = LogEntry(
-        level=LogLevel.INFO.value,
-        message="Old log message",
-        source="test_service",
-        context={"test_key": "old_value"},
-        created_at=yesterday,
-    )
-    db_session.add(old_log)
+def test_get_log_entries_after_id(client, seeded_logs):
+    """Test keyset pagination with after_id."""
+    # First page
+    response = client.get(f"{API_V1}/logs/", params={"limit": 2})
+    assert response.status_code == 200
+    first_page = response.json()
+    assert len(first_page) == 2
 
-    # Create test log entry from today
-    new_log = LogEntry(
-        level=LogLevel.INFO.value,
-        message="New log message",
-        source="test_service",
-        context={"test_key": "new_value"},
+    # Next page continues after the last ID of the first page
+    response = client.get(
+        f"{API_V1}/logs/", params={"limit": 2, "after_id": first_page[-1]["id"]}
     )
-    db_session.add(new_log)
-    db_session.commit()
+    assert response.status_code == 200
+    second_page = response.json()
+    assert len(second_page) == len(seeded_logs) - 2
+    assert {e["id"] for e in first_page}.isdisjoint(e["id"] for e in second_page)
+    assert second_page[-1]["message"] == "Old log message"
+
+
+def test_context_contains_query(monkeypatch):
+    """Test that context_contains compiles to a JSONB containment filter on PostgreSQL."""
+    monkeypatch.setattr(logging_models.settings, "LOG_CONTEXT_MSGPACK", False)
+    stmt = build_log_query(LogQueryParams(context_contains={"test_key": "test_value"}))
+
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+    assert "log_entries.context @> " in sql
+
+
+@pytest.mark.parametrize(
+    "context_contains", ['{"test_key": "test_value_1"}', "not json", '["test_value_1"]']
+)
+def test_get_log_entries_context_contains_rejected(client, context_contains):
+    """Test that context_contains is rejected off PostgreSQL or when not a JSON object."""
+    response = client.get(f"{API_V1}/logs/", params={"context_contains": context_contains})
+
+    assert response.status_code == 400
 
+
+def test_get_log_entries_with_time_range(client, seeded_logs):
+    """Test getting log entries within a time range."""
     # Send request with time range filter
-    start_time = (datetime.utcnow() - timedelta(hours=1)).isoformat()
-    response = client.get(f"{get_settings().API_V1_STR}/logs/?start_time={start_time}")
+    start_time = (datetime.now(timezone.utc) - timedelta(hours=1)).isoformat()
+    response = client.get(f"{API_V1}/logs/", params={"start_time": start_time})
 
     # Check response
     assert response.status_code == 200
     data = response.json()
-    assert len(data) == 1
-    assert data[0]["message"] == "New log message"
+    assert len(data) == 3
+    assert "Old log message" not in {entry["message"] for entry in data}
 
 
-@pytest.mark.asyncio
-async def test_export_logs(client, db_session):
+def test_export_logs(client, seeded_logs):
     """Test exporting logs to JSON."""
-    # Create test log entries
-    for i in range(3):
-        log_entry = LogEntry(
-            level=LogLevel.INFO.value,
-            message=f"Test message {i}",
-            source="test_service",
-            context={"test_key": f"test_value_{i}"},
-        )
-        db_session.add(log_entry)
-    db_session.commit()
-
     # Send request
-    response = client.get(f"{get_settings().API_V1_STR}/logs/export/json")
+    response = client.get(f"{API_V1}/logs/export/json")
 
     # Check response
     assert response.status_code == 200
@@ -148,12 +192,87 @@ async def test_export_logs(client, db_session):
     assert response.headers["Content-Disposition"].startswith("attachment")
 
     # Parse JSON data
-    data = json.loads(response.content)
-    assert len(data) == 3
+    data = orjson.loads(response.content)
+    assert len(data) == len(seeded_logs)
     assert data[0]["source"] == "test_service"
+    assert data[0]["context"] == {"test_key": "test_value_2"}
+
+
+def test_export_logs_arrow(client, seeded_logs):
+    """Test exporting logs as an Arrow IPC stream."""
+    pa = pytest.importorskip("pyarrow")
+
+    # Send request
+    response = client.get(f"{API_V1}/logs/export/arrow")
+
+    # Check response
+    assert response.status_code == 200
+    assert response.headers["Content-Type"] == "application/vnd.apache.arrow.stream"
+
+    # Parse Arrow stream
+    table = pa.ipc.open_stream(response.content).read_all()
+    assert table.num_rows == len(seeded_logs)
+    assert table.column("source")[0].as_py() == "test_service"
+
+
+def _bulk_copy_logs(db_session, rows):
+    """
+    Bulk-load log rows with COPY on PostgreSQL, or a single executemany elsewhere.
+    """
+    connection = db_session.connection()
+    if connection.dialect.name != "postgresql":
+        db_session.execute(insert(LogEntry), rows)
+        return
+
+    # COPY bypasses column defaults, so ids are generated here
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow(
+            (
+                uuid7(),
+                row["level"],
+                row["message"],
+                row["source"],
+                orjson.dumps(row["context"]).decode(),
+                row["created_at"].isoformat(),
+            )
+        )
+    buffer.seek(0)
+    with connection.connection.cursor() as cursor:
+        cursor.copy_expert(
+            "COPY log_entries (id, level, message, source, context, created_at) "
+            "FROM STDIN WITH (FORMAT csv)",
+            buffer,
+        )
+
+
+@pytest.mark.skipif(
+    not os.environ.get("LARGE_EXPORT_TEST"), reason="set LARGE_EXPORT_TEST=1 to run"
+)
+def test_export_logs_large(client, db_session):
+    """Test exporting a realistically sized set of logs."""
+    now = datetime.now(timezone.utc)
+    rows = [
+        {
+            "level": LogLevel.INFO.value,
+            "message": f"Bulk log message {i}",
+            "source": "test_service",
+            "context": {"index": i},
+            "created_at": now,
+        }
+        for i in range(LARGE_EXPORT_ROWS)
+    ]
+    _bulk_copy_logs(db_session, rows)
+    db_session.commit()
+
+    response = client.get(f"{API_V1}/logs/export/json", params={"limit": LARGE_EXPORT_ROWS})
+
+    assert response.status_code == 200
+    data = orjson.loads(response.content)
+    assert len(data) == LARGE_EXPORT_ROWS
 
 
-@pytest.mark.asyncio
 async def test_log_entry_service_methods(db_session):
     """Test LoggingService methods directly."""
     # Create log entry
@@ -182,3 +301,116 @@ async def test_log_entry_service_methods(db_session):
     log_entries = await LoggingService.get_log_entries(db_session, query_params)
     assert len(log_entries) == 1
     assert log_entries[0].id == log_entry.id
+
+    # Iterate the same query lazily
+    streamed = list(LoggingService.iter_log_entries(db_session, query_params))
+    assert [row.id for row in streamed] == [log_entry.id]
+
+
+async def test_delete_log_entries_before(db_session):
+    """Test pruning log entries older than a cutoff."""
+    # Create one old and one recent log entry in a single insert
+    now = datetime.now(timezone.utc)
+    db_session.execute(
+        insert(LogEntry),
+        [
+            {
+                "level": LogLevel.INFO.value,
+                "message": "Old log message",
+                "source": "test_service",
+                "created_at": now - timedelta(days=40),
+            },
+            {
+                "level": LogLevel.INFO.value,
+                "message": "New log message",
+                "source": "test_service",
+                "created_at": now,
+            },
+        ],
+    )
+    db_session.commit()
+
+    # Delete entries older than 30 days
+    cutoff = now - timedelta(days=30)
+    deleted = await LoggingService.delete_log_entries_before(db_session, cutoff)
+    assert deleted == 1
+
+    remaining = db_session.query(LogEntry).all()
+    assert len(remaining) == 1
+    assert remaining[0].message == "New log message"
+
+
+async def test_log_statistics(db_session):
+    """Test log statistics grouped by level and source."""
+    # Create log entries across levels and sources in a single insert
+    rows = [
+        {"level": level.value, "message": "Test message", "source": source}
+        for level, source in [
+            (LogLevel.INFO, "service_a"),
+            (LogLevel.INFO, "service_b"),
+            (LogLevel.ERROR, "service_a"),
+        ]
+    ]
+    db_session.execute(insert(LogEntry), rows)
+    db_session.commit()
+
+    stats = await LoggingService.get_log_statistics(db_session)
+    assert stats["total_count"] == 3
+    assert stats["level_counts"] == {
+        "DEBUG": 0,
+        "INFO": 2,
+        "WARNING": 0,
+        "ERROR": 1,
+        "CRITICAL": 0,
+    }
+    assert stats["source_counts"] == {"service_a": 2, "service_b": 1}
+
+
+def test_msgpack_type_round_trip():
+    """Test that MsgPackType binds and returns JSON-compatible values unchanged."""
+    pytest.importorskip("msgpack")
+    column_type = MsgPackType()
+    dialect = postgresql.dialect()
+    value = {"text": "ü", "number": 1.5, "items": [1, None, True], "nested": {"key": "value"}}
+
+    packed = column_type.process_bind_param(value, dialect)
+    assert isinstance(packed, bytes)
+    assert column_type.process_result_value(packed, dialect) == value
+    assert column_type.process_bind_param(None, dialect) is None
+    assert column_type.process_result_value(None, dialect) is None
+
+
+def test_context_contains_rejected_with_msgpack(monkeypatch):
+    """Test that context_contains is refused when context is stored as MessagePack."""
+    monkeypatch.setattr(logging_models.settings, "LOG_CONTEXT_MSGPACK", True)
+
+    with pytest.raises(ValueError):
+        build_log_query(LogQueryParams(context_contains={"test_key": "test_value"}))
+
+
+def test_logging_with_msgpack_context(client, db_session, monkeypatch):
+    """Test create, get, list and export with LOG_CONTEXT_MSGPACK enabled."""
+    pytest.importorskip("msgpack")
+    monkeypatch.setattr(logging_models.settings, "LOG_CONTEXT_MSGPACK", True)
+    context = {"test_key": "test_value", "nested": {"count": 1}}
+
+    response = client.post(
+        f"{API_V1}/logs/",
+        json={"level": "INFO", "message": "Packed", "source": "test_service", "context": context},
+    )
+    assert response.status_code == 201
+    assert response.json()["context"] == context
+
+    # Stored packed, not as JSON
+    db_log = db_session.get(LogEntry, uuid.UUID(response.json()["id"]))
+    assert db_log.context is None
+    assert db_log.context_packed == context
+
+    response = client.get(f"{API_V1}/logs/{db_log.id}")
+    assert response.json()["context"] == context
+
+    response = client.get(f"{API_V1}/logs/")
+    assert response.json()[0]["context"] == context
+
+    response = client.get(f"{API_V1}/logs/export/json")
+    assert orjson.loads(response.content)[0]["context"] == context
@@ -11,7 +11,9 @@ from app.modules.notifications.models import (
     NotificationStatus,
     NotificationType,
     NotificationCreate,
+    NotificationBulkCreate,
 )
+from app.modules.notifications.service import NotificationsService
 
 
 async def test_create_notification(client, db_session):
@@ -19,8 +21,8 @@ async def test_create_notification(client, db_session):
     notification_data = {
         "title": "Test Notification",
         "message": "This is a test notification",
-        "notification_type": "SYSTEM",
-        "priority": "NORMAL",
+        "notification_type": "info",
+        "priority": "medium",
         "recipient_id": "user123",
         "recipient_type": "user",
         "sender_id": "system",
@@ -38,7 +40,7 @@ async def test_create_notification(client, db_session):
     assert data["notification_type"] == notification_data["notification_type"]
     assert data["priority"] == notification_data["priority"]
     assert data["recipient_id"] == notification_data["recipient_id"]
-    assert data["status"] == "PENDING"
+    assert data["status"] == "pending"
 
 
 async def test_get_notifications(client, db_session):
@@ -48,8 +50,8 @@ async def test_get_notifications(client, db_session):
         notification = Notification(
             title=f"Test {i}",
             message=f"Test message {i}",
-            notification_type=NotificationType.SYSTEM.value,
-            priority=NotificationPriority.NORMAL.value,
+            notification_type=NotificationType.INFO.value,
+            priority=NotificationPriority.MEDIUM.value,
             recipient_id="user123",
             recipient_type="user",
             sender_id="system",
@@ -73,8 +75,8 @@ async def test_mark_as_read(client, db_session):
     notification = Notification(
         title="Test",
         message="Test message",
-        notification_type=NotificationType.SYSTEM.value,
-        priority=NotificationPriority.NORMAL.value,
+        notification_type=NotificationType.INFO.value,
+        priority=NotificationPriority.MEDIUM.value,
         recipient_id="user123",
         recipient_type="user",
         sender_id="system",
@@ -88,7 +90,7 @@ async def test_mark_as_read(client, db_session):
 
     assert response.status_code == 200
     data = response.json()
-    assert data["status"] == "READ"
+    assert data["status"] == "read"
     assert data["read_at"] is not None
 
     # Check database
@@ -108,8 +110,8 @@ async def test_get_unread_count(client, db_session):
         notification = Notification(
             title=f"Unread {i}",
             message=f"Unread message {i}",
-            notification_type=NotificationType.SYSTEM.value,
-            priority=NotificationPriority.NORMAL.value,
+            notification_type=NotificationType.INFO.value,
+            priority=NotificationPriority.MEDIUM.value,
             recipient_id="user123",
             recipient_type="user",
             sender_id="system",
@@ -120,8 +122,8 @@ async def test_get_unread_count(client, db_session):
     read_notification = Notification(
         title="Read",
         message="Read message",
-        notification_type=NotificationType.SYSTEM.value,
-        priority=NotificationPriority.NORMAL.value,
+        notification_type=NotificationType.INFO.value,
+        priority=NotificationPriority.MEDIUM.value,
         recipient_id="user123",
         recipient_type="user",
         sender_id="system",
@@ -147,8 +149,8 @@ async def test_mark_all_as_read(client, db_session):
         notification = Notification(
             title=f"Test {i}",
             message=f"Test message {i}",
-            notification_type=NotificationType.SYSTEM.value,
-            priority=NotificationPriority.NORMAL.value,
+            notification_type=NotificationType.INFO.value,
+            priority=NotificationPriority.MEDIUM.value,
             recipient_id="user123",
             recipient_type="user",
             sender_id="system",
@@ -183,8 +185,8 @@ async def test_clean_expired_notifications(client, db_session):
     expired_notification = Notification(
         title="Expired",
         message="Expired message",
-        notification_type=NotificationType.SYSTEM.value,
-        priority=NotificationPriority.NORMAL.value,
+        notification_type=NotificationType.INFO.value,
+        priority=NotificationPriority.MEDIUM.value,
         recipient_id="user123",
         recipient_type="user",
         sender_id="system",
@@ -196,8 +198,8 @@ async def test_clean_expired_notifications(client, db_session):
     active_notification = Notification(
         title="Active",
         message="Active message",
-        notification_type=NotificationType.SYSTEM.value,
-        priority=NotificationPriority.NORMAL.value,
+        notification_type=NotificationType.INFO.value,
+        priority=NotificationPriority.MEDIUM.value,
         recipient_id="user123",
         recipient_type="user",
         sender_id="system",
@@ -216,3 +218,23 @@ async def test_clean_expired_notifications(client, db_session):
     notifications = db_session.query(Notification).all()
     assert len(notifications) == 1
     assert notifications[0].title == "Active"
+
+
+async def test_create_bulk_notifications(db_session):
+    """Test creating notifications for several recipients in one insert."""
+    bulk_data = NotificationBulkCreate(
+        title="Bulk Notification",
+        message="This is a bulk notification",
+        recipient_ids=["user1", "user2", "user3"],
+        recipient_type="user",
+        data={"key": "value"},
+    )
+
+    notifications = await NotificationsService.create_bulk_notifications(
+        db_session, bulk_data
+    )
+
+    assert [n.recipient_id for n in notifications] == ["user1", "user2", "user3"]
+    assert all(n.status == NotificationStatus.PENDING.value for n in notifications)
+    assert all(n.data == {"key": "value"} for n in notifications)
+    assert db_session.query(Notification).count() == 3
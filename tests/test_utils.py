@@ -0,0 +1,19 @@
+"""
+Tests for the shared utilities.
+"""
+
+from datetime import datetime, timezone
+
+from app.utils.common import parse_datetime
+
+
+def test_parse_datetime_with_z_suffix():
+    """Test parsing an ISO timestamp with a trailing 'Z' as UTC."""
+    assert parse_datetime("2024-01-02T03:04:05Z") == datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+
+
+def test_parse_datetime_invalid():
+    """Test that empty and invalid inputs return None."""
+    assert parse_datetime(None) is None
+    assert parse_datetime("") is None
+    assert parse_datetime("not a date") is None